@@ -0,0 +1,900 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+댓글 분석 모듈
+==============
+- 감성 분석 / 핵심 요인 / 키워드 / 워드 클라우드 / 인사이트
+- Streamlit 에 의존하지 않으므로 스크립트·배치에서도 import 가능
+- CommentAnalysis: 영상 1개 분석 결과 (무거운 섹션은 첫 접근 시 계산 후 캐시)
+- SentimentEstimate: 대용량 댓글의 층화 표본 감성 근사 (오차 범위 포함, 점진적으로 전수 결과로 수렴)
+"""
+
+import re
+import heapq
+import math
+import random
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, defaultdict
+from functools import cached_property, lru_cache
+from itertools import islice
+import urllib.request
+import os
+
+from tokenizer import query_tokens, strip_ending, tokenize
+
+# pandas / wordcloud 는 무거운 모듈이라 해당 단계에서만 import 한다 (콜드 스타트 단축)
+
+# =============================================================================
+# 감성 분석 (맥락 기반 개선)
+# =============================================================================
+
+# 긍정 표현
+POSITIVE_EXPRESSIONS = {
+    '좋아', '좋다', '좋네', '좋은', '좋았', '좋음',
+    '최고', '대박', '멋지', '멋져', '멋있', '예쁘', '예뻐', '이쁘', '이뻐',
+    '귀엽', '귀여', '사랑', '감사', '고마', '행복', '기쁘', '즐거',
+    '훌륭', '완벽', '감동', '재밌', '재미있', '웃기', '웃겨', '힐링',
+    '짱', '쩔어', '쩐다', '미쳤', '대단', '놀랍', '신기',
+    '레전드', '갓', '인정', '추천', '천재', '역시', '찐',
+    '꿀잼', '핵잼', '존잼', '킬링', '중독', '센스',
+    '소화', '매력', '찰떡', '어울려', '어울리', '퀄리티',
+    'good', 'great', 'best', 'love', 'amazing', 'awesome', 'perfect', 'wow',
+}
+
+# 부정 표현
+NEGATIVE_EXPRESSIONS = {
+    '싫어', '싫다', '별로', '최악', '실망', '짜증', '화나', '열받',
+    '답답', '불쾌', '불편', '슬프', '슬퍼', '우울',
+    '지루', '노잼', '재미없', '못생', '쓰레기', '망했', '폭망',
+    '극혐', '혐오', '역겹', '비추', '후회', '아깝',
+    'bad', 'worst', 'hate', 'terrible', 'boring', 'trash', 'cringe',
+}
+
+# 부정 전환 패턴 (긍정어 + 이 패턴 = 부정)
+NEGATION_PATTERNS = [
+    r'재미\s*없', r'재밌지\s*않', r'좋지\s*않', r'좋은\s*거\s*없',
+    r'별로', r'아닌', r'아니', r'없어', r'없다', r'없네', r'없음',
+    r'못\s*하', r'안\s*좋', r'글쎄', r'싫',
+]
+
+# 아이러니/반어 패턴 (웃음 + 부정 맥락)
+IRONY_NEGATIVE_PATTERNS = [
+    r'어이없', r'황당', r'기가\s*막', r'할말없', r'말문이', r'헛웃음',
+    r'웃프', r'웃기지도\s*않', r'피식', r'실소', r'냉소',
+    r'뭐지', r'뭐야', r'왜이래', r'왜이러',
+]
+
+# 긍정적 욕설 패턴 (욕설이지만 긍정 맥락)
+POSITIVE_SWEAR_CONTEXT = [
+    r'미친\s*(연기|실력|퀄|비주얼|텐션|센스)',
+    r'개\s*(잘|멋|예쁘|귀엽|웃기)',
+    r'ㅅㅂ.{0,10}(좋|최고|대박|미쳤|쩔)',
+    r'(좋|최고|대박|미쳤|쩔).{0,10}ㅅㅂ',
+    r'씨발.{0,10}(좋|최고|대박)',
+]
+
+POSITIVE_EMOJIS = set('😀😃😄😁😆😅🤣😂😊😇🥰😍🤩😘👍👏🙌💪✨🌟⭐💖💗❤🔥💯🎉👑💎🏆😎🤗🥳')
+NEGATIVE_EMOJIS = set('😢😭😤😠😡🤬💔👎🙄😒😞😔😟😣😖😫😩😱🤮🤢')
+
+
+SENTIMENT_CACHE_SIZE = 100_000  # 감성 결과 메모 최대 항목 수 (프로세스 공유)
+SENTIMENT_MEMO_MAX_LEN = 40     # 이보다 긴 댓글은 반복될 일이 드물어 메모하지 않음
+
+
+def _lexicon_shape() -> tuple:
+    """사전 컨테이너 크기 (표현 추가/삭제를 매 호출마다 싸게 감지하기 위한 값)"""
+    return (
+        len(POSITIVE_EXPRESSIONS), len(NEGATIVE_EXPRESSIONS),
+        len(NEGATION_PATTERNS), len(IRONY_NEGATIVE_PATTERNS), len(POSITIVE_SWEAR_CONTEXT),
+        len(POSITIVE_EMOJIS), len(NEGATIVE_EMOJIS),
+    )
+
+
+def lexicon_fingerprint() -> int:
+    """감성 사전 내용 해시 (사전이 바뀌었는지 확인용)"""
+    return hash((
+        frozenset(POSITIVE_EXPRESSIONS), frozenset(NEGATIVE_EXPRESSIONS),
+        tuple(NEGATION_PATTERNS), tuple(IRONY_NEGATIVE_PATTERNS), tuple(POSITIVE_SWEAR_CONTEXT),
+        frozenset(POSITIVE_EMOJIS), frozenset(NEGATIVE_EMOJIS),
+    ))
+
+
+@lru_cache(maxsize=1)
+def get_lexicon() -> dict:
+    """
+    감성 사전 컴파일 (프로세스당 1회, 최초 호출 시)
+    - 패턴 목록은 하나의 alternation 정규식으로 합쳐 텍스트당 1회만 검색
+    - 표현 사전은 부분 문자열 매칭용 정규식으로 변환 (긴 표현 우선)
+    """
+    def alternation(patterns):
+        return re.compile('|'.join(f'(?:{p})' for p in patterns))
+
+    def substrings(words):
+        return re.compile('|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True)))
+
+    return {
+        'negation': alternation(NEGATION_PATTERNS),
+        'irony': alternation(IRONY_NEGATIVE_PATTERNS),
+        'positive_swear': alternation(POSITIVE_SWEAR_CONTEXT),
+        'positive': substrings(POSITIVE_EXPRESSIONS),
+        'negative': substrings(NEGATIVE_EXPRESSIONS),
+        # 어미를 뗀 어간 사전 (좋아/좋다/좋네 → 좋 으로 좋고, 좋지 등 다른 활용형도 잡는다)
+        'positive_stems': {strip_ending(w) for w in POSITIVE_EXPRESSIONS},
+        'negative_stems': {strip_ending(w) for w in NEGATIVE_EXPRESSIONS},
+        'word': re.compile(r'[가-힣]+|[a-zA-Z]+'),
+        'laugh': re.compile(r'ㅋ{2,}|ㅎ{2,}'),
+        'version': lexicon_fingerprint(),
+        'shape': _lexicon_shape(),
+    }
+
+
+def refresh_lexicon() -> bool:
+    """사전이 바뀌었으면 다시 컴파일하고 감성 메모를 비운다 (분석 시작 시 호출)"""
+    lex = get_lexicon()
+    if lex['version'] == lexicon_fingerprint() and lex['shape'] == _lexicon_shape():
+        return False
+    get_lexicon.cache_clear()
+    word_polarity.cache_clear()
+    _memo_sentiment.cache_clear()
+    return True
+
+
+def sentiment_cache_stats() -> dict:
+    """감성 메모 적중률 등 통계"""
+    info = _memo_sentiment.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hit_rate': info.hits / lookups if lookups else 0.0,
+    }
+
+
+def clear_sentiment_cache():
+    """감성 메모 비우기 (벤치마크 등에서 콜드 상태를 재현할 때)"""
+    word_polarity.cache_clear()
+    _memo_sentiment.cache_clear()
+
+
+def analyze_sentiment(text: str) -> tuple:
+    """
+    맥락 기반 감성 분석 (SENTIMENT_MEMO_MAX_LEN 이하의 짧은 댓글은 정규화한 텍스트 기준으로 메모)
+    
+    정규화는 앞뒤 공백 제거 + 소문자화만 한다. 판정은 원래 소문자 텍스트 위에서
+    이뤄지고 패턴이 앞뒤 공백에 의존하지 않으므로 결과가 달라지지 않는다.
+    ('.{0,10}' 같은 패턴 때문에 내부 공백은 건드리지 않는다)
+    
+    사전에 표현이 추가/삭제되면 호출 시 바로 감지해 메모를 비운다.
+    크기가 같은 제자리 수정은 refresh_lexicon() (분석 시작 시 지문 비교)에서 반영된다.
+    """
+    if not text:
+        return 'neutral', 0.0
+    if get_lexicon()['shape'] != _lexicon_shape():
+        refresh_lexicon()
+    normalized = text.strip().lower()
+    if len(normalized) > SENTIMENT_MEMO_MAX_LEN:
+        return score_sentiment(normalized)
+    return _memo_sentiment(normalized)
+
+
+@lru_cache(maxsize=SENTIMENT_CACHE_SIZE)
+def word_polarity(word: str) -> tuple:
+    """
+    단어 → (긍정 표현 포함 여부, 부정 표현 포함 여부)
+    - 사전 표현이 부분 문자열로 들어 있거나, 어간이 사전 어간과 같으면 해당
+    - 단어별로 메모하므로 댓글마다 사전 전체를 훑지 않는다
+    """
+    lex = get_lexicon()
+    word_stem = strip_ending(word)
+    is_pos = word_stem in lex['positive_stems'] or bool(lex['positive'].search(word))
+    is_neg = word_stem in lex['negative_stems'] or bool(lex['negative'].search(word))
+    return is_pos, is_neg
+
+
+@lru_cache(maxsize=SENTIMENT_CACHE_SIZE)
+def _memo_sentiment(text: str) -> tuple:
+    return score_sentiment(text)
+
+
+def score_sentiment(text: str) -> tuple:
+    """
+    맥락 기반 감성 분석 (메모 없이 매번 계산)
+    1. 부정 전환 패턴 체크 (재미없어 ㅋㅋㅋ → 부정)
+    2. 긍정적 욕설 패턴 체크 (미친 연기력 → 긍정)
+    3. 아이러니 패턴 체크 (어이없어서 웃음 → 부정)
+    4. 기본 키워드 분석
+    """
+    if not text:
+        return 'neutral', 0.0
+    
+    lex = get_lexicon()
+    text_lower = text.lower()
+    score = 0.0
+    
+    # === 1단계: 부정 전환 패턴 체크 ===
+    if lex['negation'].search(text_lower):
+        score -= 0.8
+    
+    # === 2단계: 아이러니/반어 패턴 ===
+    if lex['irony'].search(text_lower):
+        score -= 0.6
+    
+    # === 3단계: 긍정적 욕설 컨텍스트 ===
+    if lex['positive_swear'].search(text_lower):
+        score += 1.0
+    
+    # === 4단계: 이모지 분석 ===
+    chars = set(text)
+    pos_emoji = len(POSITIVE_EMOJIS & chars)
+    neg_emoji = len(NEGATIVE_EMOJIS & chars)
+    score += (pos_emoji - neg_emoji) * 0.2
+    
+    # === 5단계: 키워드 분석 ===
+    words = lex['word'].findall(text_lower)
+    
+    pos_count = 0
+    neg_count = 0
+    
+    for word in words:
+        is_pos, is_neg = word_polarity(word)
+        if is_pos:
+            pos_count += 1
+        if is_neg:
+            neg_count += 1
+    
+    # 부정 전환 패턴이 없을 때만 긍정 점수 부여
+    if score >= 0:  
+        score += pos_count * 0.3
+    score -= neg_count * 0.4
+    
+    # === 6단계: 웃음 표현 (맥락에 따라) ===
+    laugh = len(lex['laugh'].findall(text))
+    if laugh > 0:
+        # 부정 맥락이 없으면 긍정, 있으면 중립 유지
+        if score >= 0:
+            score += laugh * 0.2
+        # 부정 맥락 + 웃음 = 비꼼이므로 점수 유지
+    
+    # === 7단계: 최종 판정 ===
+    if score >= 0.4:
+        return 'positive', score
+    elif score <= -0.4:
+        return 'negative', score
+    return 'neutral', score
+
+
+# =============================================================================
+# 핵심 요인 분석
+# =============================================================================
+
+# 긍정 요인 키워드 그룹
+POSITIVE_FACTOR_GROUPS = {
+    '재미/유머': ['재밌', '웃기', '웃겨', '꿀잼', '핵잼', '유머', '센스', '킬링'],
+    '퀄리티/완성도': ['퀄리티', '완성도', '대박', '미쳤', '쩐다', '레전드'],
+    '출연자/비주얼': ['예쁘', '이쁘', '잘생', '비주얼', '매력', '귀엽', '귀여'],
+    '감동/공감': ['감동', '눈물', '울컥', '공감', '힐링', '따뜻'],
+    '기대/응원': ['기대', '응원', '화이팅', '파이팅', '사랑'],
+}
+
+# 부정 요인 키워드 그룹
+NEGATIVE_FACTOR_GROUPS = {
+    '지루/재미없음': ['지루', '노잼', '재미없', '별로', '심심'],
+    '실망/기대이하': ['실망', '아쉽', '기대이하', '별로'],
+    '불편/불쾌': ['불편', '불쾌', '짜증', '화나', '열받'],
+    '퀄리티 문제': ['조잡', '대충', '못', '최악', '망'],
+    '광고/상업성': ['광고', '협찬', '뻔한', '돈'],
+}
+
+FACTOR_GROUPS = {**POSITIVE_FACTOR_GROUPS, **NEGATIVE_FACTOR_GROUPS}
+
+
+def factor_scores(comments_df) -> dict:
+    """긍정/부정 요인별 언급 횟수 ({'positive': {요인: 횟수}, 'negative': {...}})"""
+    
+    results = {}
+    for sentiment, groups in (('positive', POSITIVE_FACTOR_GROUPS), ('negative', NEGATIVE_FACTOR_GROUPS)):
+        texts = comments_df[comments_df['sentiment'] == sentiment]['text']
+        scores = {}
+        
+        if len(texts) > 0:
+            joined = ' '.join(texts.tolist()).lower()
+            for factor, keywords in groups.items():
+                count = sum(joined.count(kw) for kw in keywords)
+                if count > 0:
+                    scores[factor] = count
+        
+        results[sentiment] = scores
+    
+    return results
+
+
+def top_factors(scores: dict, n: int = 3) -> dict:
+    """요인별 언급 횟수 → 감성별 상위 n개 요인"""
+    return {
+        sentiment: [f for f, _ in sorted(counts.items(), key=lambda x: -x[1])[:n]]
+        for sentiment, counts in scores.items()
+    }
+
+
+def analyze_factors(comments_df) -> dict:
+    """긍정/부정 핵심 요인 분석"""
+    return top_factors(factor_scores(comments_df))
+
+
+# =============================================================================
+# 키워드 / 워드 클라우드 / 인사이트
+# =============================================================================
+def extract_keywords(texts: list, top_n: int = 10) -> list:
+    words = []
+    for text in texts:
+        words.extend(tokenize(text))
+    
+    return Counter(words).most_common(top_n)
+
+
+def get_korean_font_path():
+    """한글 폰트 다운로드 및 경로 반환"""
+    font_path = '/tmp/NanumGothic.ttf'
+    
+    if not os.path.exists(font_path):
+        try:
+            # 나눔고딕 폰트 다운로드
+            url = 'https://github.com/naver/nanumfont/releases/download/VER2.5/NanumGothic.ttf'
+            urllib.request.urlretrieve(url, font_path)
+        except:
+            # 백업: 구글 폰트
+            try:
+                url = 'https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Regular.ttf'
+                urllib.request.urlretrieve(url, font_path)
+            except:
+                return None
+    
+    return font_path
+
+
+def generate_wordcloud(texts: list):
+    """워드 클라우드 생성"""
+    # 텍스트 전처리
+    all_words = []
+    for text in texts:
+        all_words.extend(tokenize(text))
+    
+    if not all_words:
+        return None
+    
+    word_freq = Counter(all_words)
+    
+    # 폰트 경로
+    font_path = get_korean_font_path()
+    
+    if not font_path or not os.path.exists(font_path):
+        return None
+    
+    # 워드 클라우드 생성 (wordcloud 는 numpy/PIL/matplotlib 을 끌어오므로 여기서 import)
+    from wordcloud import WordCloud
+    
+    wc = WordCloud(
+        font_path=font_path,
+        width=800,
+        height=400,
+        background_color='white',
+        colormap='copper',  # 브라운 톤 컬러맵
+        max_words=50,
+        prefer_horizontal=0.7,
+        min_font_size=12,
+        max_font_size=100,
+    )
+    
+    wc.generate_from_frequencies(word_freq)
+    
+    return wc
+
+
+def generate_insight(video_info, pos_pct, neg_pct, factors, keywords) -> str:
+    insights = []
+    
+    # 전반적 반응
+    if pos_pct >= 70:
+        insights.append(f"시청자 반응이 매우 긍정적입니다(긍정 {pos_pct:.0f}%). 바이럴 가능성이 높고, 시리즈화나 유사 콘텐츠 기획이 유효합니다.")
+    elif pos_pct >= 50:
+        insights.append(f"전반적으로 호의적인 반응입니다(긍정 {pos_pct:.0f}%). 개선 포인트를 파악하면 더 높은 만족도를 이끌어낼 수 있습니다.")
+    elif neg_pct >= 30:
+        insights.append(f"부정적 반응이 상당합니다(부정 {neg_pct:.0f}%). 핵심 불만 요인을 파악하고 대응이 필요합니다.")
+    else:
+        insights.append(f"반응이 혼재되어 있습니다. 긍정과 부정 요인을 모두 분석해볼 필요가 있습니다.")
+    
+    # 핵심 요인 기반
+    if factors.get('positive'):
+        top_factor = factors['positive'][0]
+        insights.append(f"긍정 반응의 핵심은 '{top_factor}'입니다. 이 강점을 유지하거나 강화하세요.")
+    
+    if factors.get('negative'):
+        top_factor = factors['negative'][0]
+        insights.append(f"부정 반응의 주요 원인은 '{top_factor}'로 보입니다. 개선 또는 해명이 도움이 될 수 있습니다.")
+    
+    # 키워드 기반
+    if keywords:
+        top_kw = keywords[0][0]
+        insights.append(f"가장 많이 언급된 '{top_kw}'를 중심으로 후속 콘텐츠를 기획해보세요.")
+    
+    return " ".join(insights)
+
+
+# =============================================================================
+# 대표 댓글 인덱스
+# =============================================================================
+RANKED_FILTER_CACHE_SIZE = 64   # 요인/키워드 필터 결과를 보관하는 최대 개수 (세션마다)
+
+
+class RankedIndex:
+    """
+    좋아요 순 댓글 인덱스
+    - 전체/감성별 좋아요 내림차순 id 배열을 한 번만 정렬해 두고 슬라이스로 조회
+    - 키워드 필터는 토큰 → 좋아요 순 id 포스팅에서 시작 (필터마다 전체 댓글을 다시 토큰화하지 않음)
+      여러 단어면 모든 단어가 들어 있는 댓글만 (AND)
+      tokens 로 댓글별 토큰(CommentAnalysis.tokens)을 받으면 그대로 쓰고, 없으면 처음 필터할 때 토큰화
+    - 요인별 좋아요 순 id 배열은 요인마다 처음 한 번만 만든다
+    - 필터 조합은 가장 짧은 배열(감성 / 요인 / 키워드 포스팅)을 따라가며 나머지는 O(1) 포함 검사
+      → 결과도 좋아요 순 배열, 최근 RANKED_FILTER_CACHE_SIZE 개만 캐시
+    - 좋아요가 같으면 원래 댓글 순서 유지 (DataFrame.nlargest 와 동일)
+    """
+    
+    SENTIMENTS = ('positive', 'neutral', 'negative')
+    
+    def __init__(self, comments: list, tokens: list = None):
+        self.comments = comments
+        self._tokens = tokens
+        self._postings = None
+        self._token_sets = None
+        self._factors = {}
+        order = sorted(range(len(comments)), key=lambda i: -comments[i]['likes'])
+        self._ranked = {(None, None, None): order}
+        for sentiment in self.SENTIMENTS:
+            self._ranked[(sentiment, None, None)] = [i for i in order if comments[i]['sentiment'] == sentiment]
+        self._filtered = OrderedDict()
+    
+    def _posting(self, token: str) -> list:
+        """토큰이 들어 있는 댓글 id (좋아요 순)"""
+        if self._postings is None:
+            tokens = self._tokens or [tokenize(c['text']) for c in self.comments]
+            postings = defaultdict(list)
+            for i in self.order:
+                for t in dict.fromkeys(tokens[i]):
+                    postings[t].append(i)
+            self._postings = dict(postings)
+            self._token_sets = [set(t) for t in tokens]
+        return self._postings.get(token, [])
+    
+    def _factor(self, factor: str) -> tuple:
+        """요인 키워드가 들어 있는 댓글 (좋아요 순 id 배열, id 집합) — 요인마다 한 번만 계산"""
+        if factor not in self._factors:
+            patterns = FACTOR_GROUPS.get(factor, [])
+            ids = [i for i in self.order if any(p in self.comments[i]['text'].lower() for p in patterns)]
+            self._factors[factor] = (ids, set(ids))
+        return self._factors[factor]
+    
+    def _ids(self, sentiment, factor, keyword) -> list:
+        keyword = ' '.join((keyword or '').split()) or None
+        if not factor and not keyword:
+            return self._ranked[(sentiment, None, None)]
+        
+        key = (sentiment, factor, keyword)
+        if key in self._filtered:
+            self._filtered.move_to_end(key)
+            return self._filtered[key]
+        
+        # (좋아요 순 id 배열, 포함 검사) — 가장 짧은 배열을 따라가면 좋아요 순서가 그대로 유지된다
+        filters = []
+        if sentiment:
+            filters.append((self._ranked[(sentiment, None, None)],
+                            lambda i: self.comments[i]['sentiment'] == sentiment))
+        if factor:
+            factor_ids, members = self._factor(factor)
+            filters.append((factor_ids, members.__contains__))
+        if keyword:
+            # 여러 단어 키워드는 단어마다 검색어와 같은 어간으로 바꿔 모두 포함(AND), 불용어는 무시
+            for token in dict.fromkeys(t for word in keyword.split() for t in query_tokens(word)):
+                filters.append((self._posting(token), lambda i, token=token: token in self._token_sets[i]))
+        
+        if filters:
+            driver = min(range(len(filters)), key=lambda n: len(filters[n][0]))
+            checks = [check for n, (_, check) in enumerate(filters) if n != driver]
+            ids = [i for i in filters[driver][0] if all(check(i) for check in checks)]
+        else:
+            ids = self.order
+        
+        self._filtered[key] = ids
+        if len(self._filtered) > RANKED_FILTER_CACHE_SIZE:
+            self._filtered.popitem(last=False)
+        return ids
+    
+    @property
+    def order(self) -> list:
+        """좋아요 내림차순 전체 댓글 id"""
+        return self._ranked[(None, None, None)]
+    
+    def count(self, sentiment: str = None, factor: str = None, keyword: str = None) -> int:
+        return len(self._ids(sentiment, factor, keyword))
+    
+    def top(self, k: int, sentiment: str = None, offset: int = 0,
+            factor: str = None, keyword: str = None) -> list:
+        """좋아요 상위 댓글 k개 (offset 부터, 페이지 넘김용)"""
+        ids = self._ids(sentiment, factor, keyword or None)
+        return [self.comments[i] for i in ids[offset:offset + k]]
+
+
+# =============================================================================
+# 댓글 검색 (역색인)
+# =============================================================================
+class SearchIndex:
+    """
+    토큰 → 댓글 역색인
+    - 포스팅 리스트는 댓글 id 대신 좋아요 순위(rank)를 오름차순으로 저장
+      → 결과가 이미 좋아요 순이라 정렬 없이 앞에서부터 limit 개만 꺼내면 된다
+    - 질의 문법: 공백 = AND, 'OR' = 또는, '-단어' = 제외, '단어*' = 접두어
+    - 검색어도 색인과 같은 토크나이저로 어간화 (재밌어요 → 재밌, 광고가 → 광고), 불용어는 무시
+    
+    검색창 예시 (python -m doctest analyzer.py 로 확인)
+    >>> texts = ['광고 너무 많아요', '광고가 길어요', '노래 좋다 광고', '노래 최고', '연기 재밌어요']
+    >>> comments = [{'text': t, 'likes': 0, 'sentiment': 'neutral'} for t in texts]
+    >>> index = SearchIndex(comments, list(range(len(texts))), [tokenize(t) for t in texts])
+    >>> [c['text'] for c in index.search('연기 OR 노래')]
+    ['노래 좋다 광고', '노래 최고', '연기 재밌어요']
+    >>> [c['text'] for c in index.search('재밌*')]
+    ['연기 재밌어요']
+    >>> [c['text'] for c in index.search('노래 -광고')]
+    ['노래 최고']
+    >>> [c['text'] for c in index.search('광고')]
+    ['광고 너무 많아요', '광고가 길어요', '노래 좋다 광고']
+    """
+    
+    def __init__(self, comments: list, order: list, tokens: list):
+        self.comments = comments
+        self._order = order
+        postings = defaultdict(list)
+        for rank, i in enumerate(order):
+            for token in dict.fromkeys(tokens[i]):
+                postings[token].append(rank)
+        self._postings = dict(postings)
+        self._vocab = sorted(self._postings)
+        self._sentiments = [comments[i]['sentiment'] for i in order]
+        self._sets = {}
+    
+    @staticmethod
+    def parse(query: str) -> list:
+        """질의 → [(포함 단어 목록, 제외 단어 목록), ...] (OR 로 묶인 AND 절)"""
+        clauses = []
+        for part in re.split(r'\s+OR\s+', query.strip()):
+            include, exclude = [], []
+            for term in part.lower().split():
+                negate = term.startswith('-') and len(term) > 1
+                term = term[1:] if negate else term
+                if term == '-':
+                    continue
+                # 접두어 검색은 입력 그대로, 나머지는 색인과 같은 어간으로 (색인에 없는 불용어는 무시)
+                terms = [term] if term.endswith('*') else query_tokens(term)
+                (exclude if negate else include).extend(terms)
+            if include or exclude:
+                clauses.append((include, exclude))
+        return clauses
+    
+    def _tokens(self, term: str) -> list:
+        if not term.endswith('*'):
+            return [term] if term in self._postings else []
+        prefix = term[:-1]
+        if not prefix:
+            return []
+        start = bisect_left(self._vocab, prefix)
+        end = bisect_left(self._vocab, prefix + '\uffff', start)
+        return self._vocab[start:end]
+    
+    def _ranks(self, term: str):
+        """단어의 rank 스트림 (오름차순, 중복 없음)"""
+        tokens = self._tokens(term)
+        if len(tokens) == 1:
+            return iter(self._postings[tokens[0]])
+        return _unique(heapq.merge(*(self._postings[t] for t in tokens)))
+    
+    def _size(self, term: str) -> int:
+        return sum(len(self._postings[t]) for t in self._tokens(term))
+    
+    def _set(self, term: str) -> set:
+        if term not in self._sets:
+            ranks = set()
+            for t in self._tokens(term):
+                ranks.update(self._postings[t])
+            self._sets[term] = ranks
+        return self._sets[term]
+    
+    def _clause_ranks(self, include: list, exclude: list):
+        # 가장 짧은 포스팅을 따라가며 나머지 조건은 집합 조회로 확인
+        if include:
+            include = sorted(include, key=self._size)
+            driver, rest = self._ranks(include[0]), [self._set(t) for t in include[1:]]
+        else:
+            driver, rest = iter(range(len(self._order))), []
+        excluded = [self._set(t) for t in exclude]
+        for rank in driver:
+            if all(rank in s for s in rest) and not any(rank in s for s in excluded):
+                yield rank
+    
+    def _matches(self, query: str, sentiment: str = None):
+        clauses = self.parse(query)
+        if not clauses:
+            return iter(())
+        streams = [self._clause_ranks(inc, exc) for inc, exc in clauses]
+        ranks = streams[0] if len(streams) == 1 else _unique(heapq.merge(*streams))
+        if sentiment:
+            ranks = (r for r in ranks if self._sentiments[r] == sentiment)
+        return ranks
+    
+    def search(self, query: str, sentiment: str = None, limit: int = 20, offset: int = 0) -> list:
+        """질의에 맞는 댓글을 좋아요 순으로 offset 부터 limit 개"""
+        ranks = islice(self._matches(query, sentiment), offset, offset + limit)
+        return [self.comments[self._order[r]] for r in ranks]
+    
+    def count(self, query: str, sentiment: str = None) -> int:
+        matched = set()
+        for include, exclude in self.parse(query):
+            ranks = set.intersection(*(self._set(t) for t in include)) if include else set(range(len(self._order)))
+            for t in exclude:
+                ranks = ranks - self._set(t)
+            matched |= ranks
+        if sentiment:
+            return sum(1 for r in matched if self._sentiments[r] == sentiment)
+        return len(matched)
+
+
+def _unique(ranks):
+    """정렬된 스트림에서 연속 중복 제거"""
+    last = None
+    for r in ranks:
+        if r != last:
+            yield r
+            last = r
+
+
+# =============================================================================
+# 분석 결과
+# =============================================================================
+class CommentAnalysis:
+    """
+    영상 1개 분석 결과
+    - 생성 시: 댓글별 감성 판정 + 감성 비율 (헤드라인 수치)
+    - 나머지 섹션은 처음 요청될 때 계산하고 인스턴스에 캐시
+      (Streamlit 재실행 시 session_state 에 보관된 객체를 그대로 재사용)
+    - scored=True 면 댓글에 이미 있는 sentiment/score 를 그대로 사용 (SentimentEstimate 가 판정한 경우)
+    """
+    
+    def __init__(self, video_info: dict, comments: list, scored: bool = False):
+        self.video_info = video_info
+        if scored:
+            self.comments = list(comments)
+        else:
+            self.comments = []
+            refresh_lexicon()
+            for c in comments:
+                sent, score = analyze_sentiment(c.get('text', ''))
+                self.comments.append({**c, 'sentiment': sent, 'score': score})
+        
+        counts = Counter(c['sentiment'] for c in self.comments)
+        self.total = len(self.comments)
+        self.pos_count = counts['positive']
+        self.neg_count = counts['negative']
+        self.neu_count = self.total - self.pos_count - self.neg_count
+    
+    @property
+    def pos_pct(self) -> float:
+        return self.pos_count / self.total * 100 if self.total else 0.0
+    
+    @property
+    def neg_pct(self) -> float:
+        return self.neg_count / self.total * 100 if self.total else 0.0
+    
+    @property
+    def neu_pct(self) -> float:
+        return self.neu_count / self.total * 100 if self.total else 0.0
+    
+    @cached_property
+    def df(self):
+        import pandas as pd
+        
+        return pd.DataFrame(self.comments)
+    
+    @cached_property
+    def texts(self) -> list:
+        return [c['text'] for c in self.comments]
+    
+    @cached_property
+    def tokens(self) -> list:
+        """댓글별 토큰 (키워드·검색 색인이 함께 사용)"""
+        return [tokenize(t) for t in self.texts]
+    
+    @cached_property
+    def keyword_counts(self) -> Counter:
+        return Counter(t for tokens in self.tokens for t in tokens)
+    
+    @cached_property
+    def keywords(self) -> list:
+        return self.keyword_counts.most_common(10)
+    
+    @cached_property
+    def factor_scores(self) -> dict:
+        return factor_scores(self.df)
+    
+    @cached_property
+    def factors(self) -> dict:
+        return top_factors(self.factor_scores)
+    
+    @cached_property
+    def insight(self) -> str:
+        return generate_insight(self.video_info, self.pos_pct, self.neg_pct, self.factors, self.keywords)
+    
+    @cached_property
+    def wordcloud(self):
+        """워드 클라우드 이미지 배열 (생성 불가 시 None)"""
+        wc = generate_wordcloud(self.texts)
+        return wc.to_array() if wc else None
+    
+    @cached_property
+    def ranking(self) -> RankedIndex:
+        return RankedIndex(self.comments, self.tokens)
+    
+    @cached_property
+    def search_index(self) -> SearchIndex:
+        return SearchIndex(self.comments, self.ranking.order, self.tokens)
+    
+    def search(self, query: str, sentiment: str = None, limit: int = 20, offset: int = 0) -> list:
+        """댓글 검색 (SearchIndex 질의 문법, 좋아요 순)"""
+        return self.search_index.search(query, sentiment, limit, offset)
+    
+    @cached_property
+    def timeline(self):
+        """작성일별 감성 댓글 수 (날짜 × positive/neutral/negative), 작성 시각이 없으면 None"""
+        import pandas as pd
+        
+        if 'timestamp' not in self.df:
+            return None
+        dated = self.df.dropna(subset=['timestamp'])
+        if dated.empty:
+            return None
+        dates = pd.to_datetime(dated['timestamp'], unit='s').dt.date.rename('date')
+        table = pd.crosstab(dates, dated['sentiment'])
+        return table.reindex(columns=['positive', 'neutral', 'negative'], fill_value=0)
+
+
+# =============================================================================
+# 근사 분석 (대용량 영상)
+# =============================================================================
+SAMPLE_MARGIN = 2.0         # 목표 오차 (±%p, 95% 신뢰)
+SAMPLE_Z = 1.96             # 95% 신뢰구간
+SAMPLE_BATCH = 2_000        # refine() 한 번에 판정하는 댓글 수
+SAMPLE_MIN_COMMENTS = 20_000  # 이보다 적으면 근사 없이 바로 전수 분석
+LIKE_STRATA = (1, 10, 100)  # 좋아요 구간 경계 (0 / 1~9 / 10~99 / 100+)
+TIME_STRATA = 4             # 작성 시기 구간 수 (댓글 수 기준 등분, 시각 없는 댓글은 별도 구간)
+
+
+def _strata(comments: list) -> list:
+    """댓글별 층 번호 (좋아요 구간 × 작성 시기 구간)"""
+    stamps = sorted(c['timestamp'] for c in comments if c.get('timestamp') is not None)
+    edges = [stamps[len(stamps) * i // TIME_STRATA] for i in range(1, TIME_STRATA)] if stamps else []
+    
+    strata = []
+    for c in comments:
+        likes = bisect_right(LIKE_STRATA, c.get('likes') or 0)
+        stamp = c.get('timestamp')
+        period = TIME_STRATA if stamp is None else bisect_right(edges, stamp)
+        strata.append(likes * (TIME_STRATA + 1) + period)
+    return strata
+
+
+class SentimentEstimate:
+    """
+    대용량 댓글의 감성 비율 근사
+    - 좋아요 구간 × 작성 시기 구간으로 층을 나누고, 층마다 섞은 뒤 층 크기에 비례해 교차시킨 순서로 판정
+      → 앞에서부터 몇 개를 판정하든 그 표본은 비례 배분 층화 표본
+    - 감성 비율마다 95% 신뢰구간 반폭(±%p)을 층화 추정 분산 + 유한 모집단 보정으로 계산
+    - refine() 을 반복하면 표본이 커지며 전수 결과로 수렴 (끝나면 오차 0, analysis() 로 전체 분석)
+    - start() 로 백그라운드 스레드에서 끝까지 판정 (estimate() 는 언제든 호출 가능)
+    """
+    
+    def __init__(self, video_info: dict, comments: list, seed: int = None):
+        self.video_info = video_info
+        self.comments = comments
+        self.total = len(comments)
+        self.processed = 0
+        self._results = [None] * self.total
+        self._strata = _strata(comments)
+        self._sizes = Counter(self._strata)
+        self._counts = defaultdict(Counter)     # 층 → 판정된 감성 수
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cancelled = False
+        
+        rnd = random.Random(seed)
+        members = defaultdict(list)
+        for i, stratum in enumerate(self._strata):
+            members[stratum].append(i)
+        keyed = []
+        for ids in members.values():
+            rnd.shuffle(ids)
+            size = len(ids)
+            keyed.extend(((j + rnd.random()) / size, i) for j, i in enumerate(ids))
+        keyed.sort()
+        self._order = [i for _, i in keyed]
+        refresh_lexicon()
+    
+    @property
+    def done(self) -> bool:
+        return self.processed >= self.total
+    
+    def refine(self, n: int = SAMPLE_BATCH) -> bool:
+        """다음 n 개 댓글 판정 (모두 판정했으면 True)"""
+        with self._lock:
+            batch = self._order[self.processed:self.processed + n]
+            for i in batch:
+                sent, score = analyze_sentiment(self.comments[i].get('text', ''))
+                self._results[i] = (sent, score)
+                self._counts[self._strata[i]][sent] += 1
+            self.processed += len(batch)
+            return self.done
+    
+    def refine_to(self, margin: float = SAMPLE_MARGIN) -> dict:
+        """모든 감성 비율의 오차가 margin(%p) 이하가 될 때까지 판정 후 추정치 반환"""
+        while True:
+            estimate = self.estimate()
+            if self.done or (self.processed and max(m for _, m in estimate.values()) <= margin):
+                return estimate
+            self.refine()
+    
+    def estimate(self) -> dict:
+        """{'positive' | 'neutral' | 'negative': (비율 %, 오차 ±%p)} — 판정 전에는 (0, 100)"""
+        with self._lock:
+            sampled = {h: sum(c.values()) for h, c in self._counts.items()}
+            weight = sum(self._sizes[h] for h in sampled)
+            result = {}
+            for sentiment in ('positive', 'neutral', 'negative'):
+                if not weight:
+                    result[sentiment] = (0.0, 100.0)
+                    continue
+                pct, variance = 0.0, 0.0
+                for h, n in sampled.items():
+                    size = self._sizes[h]
+                    w = size / weight
+                    p = self._counts[h][sentiment] / n
+                    pct += w * p
+                    if n < size:
+                        # 표본이 1개뿐인 층은 가장 보수적인 분산(p=0.5)으로
+                        spread = p * (1 - p) / (n - 1) if n > 1 else 0.25
+                        variance += w * w * (1 - n / size) * spread
+                result[sentiment] = (pct * 100, SAMPLE_Z * math.sqrt(variance) * 100)
+            return result
+    
+    # === 백그라운드 판정 ===
+    def start(self):
+        """남은 댓글을 데몬 스레드에서 끝까지 판정 (이미 실행 중이면 무시)"""
+        if self._thread is None and not self.done:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+    
+    def _run(self):
+        while not self._cancelled and not self.refine():
+            pass
+    
+    def cancel(self):
+        """백그라운드 판정 중단 (다른 영상 분석으로 넘어갈 때)"""
+        self._cancelled = True
+    
+    def analysis(self) -> CommentAnalysis:
+        """전수 판정이 끝난 뒤 전체 분석 결과 (판정 결과를 그대로 사용)"""
+        if not self.done:
+            raise RuntimeError("아직 판정하지 않은 댓글이 있습니다.")
+        comments = [
+            {**c, 'sentiment': sent, 'score': score}
+            for c, (sent, score) in zip(self.comments, self._results)
+        ]
+        return CommentAnalysis(self.video_info, comments, scored=True)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+댓글 아카이브
+=============
+- 수집한 댓글을 영상 단위로 디스크에 계속 덧붙여 보관 (append-only)
+- texts.bin   : [uint32 길이][UTF-8 본문] 의 연속
+- records.bin : 댓글당 고정 폭 레코드 (본문 위치, 좋아요, 작성 시각, 감성, 점수)
+- index.jsonl : 영상별 스냅샷 (레코드/본문 구간, 영상 정보) — 마지막 줄이 기록 완료 지점
+- 읽기는 mmap 으로 해당 영상 구간만 잘라 쓰므로 다른 영상은 읽지도 파싱하지도 않는다
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from analyzer import CommentAnalysis
+
+# =============================================================================
+# 설정
+# =============================================================================
+ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', os.path.join('data', 'archive'))
+
+RECORD_DTYPE = np.dtype([
+    ('text_offset', '<u8'),   # texts.bin 안의 본문 시작 위치 (길이 접두어 다음)
+    ('text_len', '<u4'),      # 본문 바이트 수
+    ('likes', '<i8'),
+    ('timestamp', '<i8'),     # 작성 시각 (epoch 초, 없으면 -1)
+    ('sentiment', 'i1'),      # 1 긍정 / 0 중립 / -1 부정
+    ('score', '<f4'),
+])
+
+LENGTH_PREFIX = struct.Struct('<I')
+SENTIMENT_CODES = {'positive': 1, 'neutral': 0, 'negative': -1}
+SENTIMENT_NAMES = {code: name for name, code in SENTIMENT_CODES.items()}
+
+# 같은 프로세스의 여러 세션이 동시에 덧붙이지 않도록 (프로세스 간 잠금은 하지 않음)
+_append_lock = threading.Lock()
+
+
+# =============================================================================
+# 아카이브
+# =============================================================================
+class CommentArchive:
+    """
+    영상별 댓글 아카이브
+    - append(): 스냅샷 추가 (같은 영상을 다시 넣으면 최신 스냅샷이 우선)
+    - records(): 해당 영상의 레코드 배열 (mmap 위의 뷰, 복사 없음)
+    - texts() / load() / analysis(): 필요한 영상의 본문만 디코딩
+    """
+    
+    def __init__(self, root: str = ARCHIVE_DIR):
+        self.root = root
+        self.texts_path = os.path.join(root, 'texts.bin')
+        self.records_path = os.path.join(root, 'records.bin')
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self._index = None
+        self._maps = {}
+    
+    # === 색인 ===
+    def _load_index(self) -> dict:
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue    # 기록 중 중단된 마지막 줄
+                        self._index[entry['video_id']] = entry
+        return self._index
+    
+    def _committed_end(self) -> tuple:
+        """색인에 기록된 마지막 (레코드 수, 본문 바이트) — 그 뒤는 중단된 쓰기"""
+        records_end, texts_end = 0, 0
+        for entry in self._load_index().values():
+            records_end = max(records_end, entry['record_start'] + entry['count'])
+            texts_end = max(texts_end, entry['text_end'])
+        return records_end, texts_end
+    
+    def videos(self) -> dict:
+        """video_id → 스냅샷 정보 (영상 정보, 댓글 수, 저장 시각)"""
+        return dict(self._load_index())
+    
+    def get(self, video_id: str):
+        """영상의 최신 스냅샷 정보 (없으면 None)"""
+        return self._load_index().get(video_id)
+    
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._load_index()
+    
+    # === 쓰기 ===
+    def append(self, video_id: str, comments: list, video_info: dict = None) -> dict:
+        """
+        댓글 스냅샷 추가
+        comments: {'text', 'likes', 'timestamp'(선택), 'sentiment'(선택), 'score'(선택)} 목록
+        """
+        with _append_lock:
+            os.makedirs(self.root, exist_ok=True)
+            self._index = None    # 다른 인스턴스가 덧붙였을 수 있으므로 색인을 다시 읽는다
+            records_end, texts_end = self._committed_end()
+            
+            rows = []
+            blobs = bytearray()
+            for c in comments:
+                data = (c.get('text') or '').encode('utf-8')
+                blobs += LENGTH_PREFIX.pack(len(data))
+                timestamp = c.get('timestamp')
+                rows.append((
+                    texts_end + len(blobs),
+                    len(data),
+                    int(c.get('likes') or 0),
+                    -1 if timestamp is None or timestamp != timestamp else int(timestamp),
+                    SENTIMENT_CODES.get(c.get('sentiment'), 0),
+                    c.get('score') or 0.0,
+                ))
+                blobs += data
+            records = np.array(rows, dtype=RECORD_DTYPE)
+            
+            # 본문 → 레코드 → 색인 순서로 기록 (색인 줄이 써져야 스냅샷이 보인다)
+            self._write_at(self.texts_path, texts_end, bytes(blobs))
+            self._write_at(self.records_path, records_end * RECORD_DTYPE.itemsize, records.tobytes())
+            
+            entry = {
+                'video_id': video_id,
+                'record_start': records_end,
+                'count': len(comments),
+                'text_end': texts_end + len(blobs),
+                'archived_at': int(time.time()),
+                'video_info': video_info or {},
+            }
+            line = json.dumps(entry, ensure_ascii=False) + '\n'
+            with open(self.index_path, 'ab') as f:
+                # 중단된 쓰기로 줄바꿈 없이 끝났다면 새 줄에서 시작
+                if f.tell() > 0 and not self._ends_with_newline():
+                    line = '\n' + line
+                f.write(line.encode('utf-8'))
+            
+            self._load_index()[video_id] = entry
+            return entry
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.index_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    
+    @staticmethod
+    def _write_at(path: str, offset: int, data: bytes):
+        # 중단된 이전 쓰기가 남긴 꼬리는 잘라내고 이어 쓴다
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+            f.truncate(offset)
+            f.seek(offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    # === 읽기 ===
+    def _map(self, path: str) -> mmap.mmap:
+        size = os.path.getsize(path)
+        mapped = self._maps.get(path)
+        if mapped is None or len(mapped) < size:
+            # 이전 mmap 은 넘겨준 배열 뷰가 남아 있을 수 있으므로 닫지 않고 참조만 교체
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[path] = mapped
+        return mapped
+    
+    def records(self, video_id: str) -> np.ndarray:
+        """영상의 레코드 배열 (읽기 전용 mmap 뷰)"""
+        entry = self._load_index()[video_id]
+        if entry['count'] == 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.frombuffer(
+            self._map(self.records_path), dtype=RECORD_DTYPE,
+            count=entry['count'], offset=entry['record_start'] * RECORD_DTYPE.itemsize,
+        )
+    
+    def _decode(self, records: np.ndarray) -> list:
+        if len(records) == 0:
+            return []
+        texts = self._map(self.texts_path)
+        return [
+            texts[offset:offset + length].decode('utf-8')
+            for offset, length in zip(records['text_offset'].tolist(), records['text_len'].tolist())
+        ]
+    
+    def texts(self, video_id: str) -> list:
+        return self._decode(self.records(video_id))
+    
+    def load(self, video_id: str, limit: int = None) -> tuple:
+        """
+        (영상 정보, 댓글 목록) — fetch_video_data 와 같은 형태 + 저장된 감성/점수
+        limit: 좋아요 상위 limit 개만 (인기순 수집과 같은 기준, 나머지 본문은 디코딩하지 않음)
+        """
+        entry = self._load_index()[video_id]
+        records = self.records(video_id)
+        if limit is not None and len(records) > limit:
+            records = records[np.argsort(-records['likes'], kind='stable')[:limit]]
+        comments = []
+        for text, likes, timestamp, sentiment, score in zip(
+            self._decode(records), records['likes'].tolist(), records['timestamp'].tolist(),
+            records['sentiment'].tolist(), records['score'].tolist(),
+        ):
+            comments.append({
+                'text': text,
+                'likes': likes,
+                'timestamp': None if timestamp < 0 else timestamp,
+                'sentiment': SENTIMENT_NAMES[sentiment],
+                'score': score,
+            })
+        return entry['video_info'], comments
+    
+    def analysis(self, video_id: str, limit: int = None) -> CommentAnalysis:
+        """아카이브된 댓글로 재분석 (현재 감성 사전 기준으로 다시 판정, limit 은 load() 와 같음)"""
+        video_info, comments = self.load(video_id, limit)
+        return CommentAnalysis(video_info, comments)
+    
+    def close(self):
+        """mmap 참조 해제 (넘겨준 배열 뷰가 모두 사라지면 매핑도 해제된다)"""
+        self._maps.clear()
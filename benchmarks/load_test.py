@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+부하 테스트
+===========
+- 동시 세션 N 개가 분석 경로를 반복 실행할 때의 처리량 / 지연 분위수 / 메모리 증가 / 캐시 효율
+- fetch_video_data 대신 지연을 설정할 수 있는 재생(replay) 백엔드 사용
+  (합성 댓글 또는 댓글 아카이브에 저장된 실제 영상)
+- 수집 결과는 앱과 같은 st.cache_data 로 감싸서 캐시·동시 요청 합치기 동작까지 함께 측정
+- 모드
+  api : CommentAnalysis 를 직접 호출 (헤드라인 + 대표 댓글 + 검색)
+  app : streamlit AppTest 로 앱 스크립트 전체 실행 (세션 1개 = AppTest 1개)
+        요약/아카이브는 실행마다 만드는 임시 디렉터리에 기록하고 끝나면 지운다 (data/ 는 건드리지 않음)
+
+사용법:
+  python benchmarks/load_test.py --concurrency 1 4 16 --requests 200 --latency 300
+  python benchmarks/load_test.py --mode app --archive data/archive
+"""
+
+import argparse
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit as st
+from streamlit import logger as st_logger
+
+import analyzer
+import tokenizer
+from analyzer import CommentAnalysis
+
+MAX_COMMENTS = 500
+
+# 인기 영상 댓글처럼 짧은 반복 댓글이 많은 분포
+COMMON_COMMENTS = ['ㅋㅋㅋㅋ', '최고', '1등', '😂😂😂', '👍', '대박', 'ㅋㅋㅋㅋㅋㅋ', '좋아요', '미쳤다', '❤️']
+PHRASES = ['연기 진짜 미쳤다', '노래 너무 좋아요', '재밌어요 ㅋㅋㅋ', '이건 좀 별로네요', '광고가 너무 많아요',
+           '편집 센스 최고', '지루해서 중간에 껐어요', '목소리 힐링된다', '어이없네 ㅋㅋ', '다음 편 기대합니다',
+           '비주얼 무슨 일이야', '노잼', '감동 받았어요 😢', '완전 레전드 영상', '이게 왜 인기임?']
+
+
+# =============================================================================
+# 재생 백엔드
+# =============================================================================
+class ReplayBackend:
+    """video_id → (영상 정보, 댓글) 을 돌려주는 가짜 수집기 (지연 + 호출 수 기록)"""
+    
+    def __init__(self, fixtures: dict, latency_ms: float, jitter_ms: float):
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.calls = Counter()
+        self._lock = threading.Lock()
+    
+    def fetch(self, url: str, max_comments: int):
+        video_id = url.rsplit('v=', 1)[-1]
+        with self._lock:
+            self.calls[video_id] += 1
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        video_info, comments = self.fixtures[video_id]
+        return dict(video_info), [dict(c) for c in comments[:max_comments]]
+
+
+def synthetic_fixtures(n_videos: int, n_comments: int, seed: int = 0) -> dict:
+    rnd = random.Random(seed)
+    fixtures = {}
+    for v in range(n_videos):
+        comments = []
+        for i in range(n_comments):
+            if rnd.random() < 0.3:
+                text = rnd.choice(COMMON_COMMENTS)
+            else:
+                text = ' '.join(rnd.sample(PHRASES, rnd.randint(1, 3)))
+            comments.append({'text': text, 'likes': int(rnd.paretovariate(1.2)) - 1,
+                             'timestamp': 1700000000 + rnd.randint(0, 30 * 86400)})
+        fixtures[f'load{v:07d}'] = ({'title': f'테스트 영상 {v}', 'channel': '부하 테스트', 'upload_date': '2024.01.01',
+                                     'view_count': 0, 'like_count': 0, 'total_comments': n_comments}, comments)
+    return fixtures
+
+
+def archive_fixtures(path: str, limit: int) -> dict:
+    from archive import CommentArchive
+    
+    archive = CommentArchive(path)
+    fixtures = {}
+    for video_id in list(archive.videos())[:limit]:
+        video_info, comments = archive.load(video_id)
+        fixtures[video_id] = (video_info, [{k: c[k] for k in ('text', 'likes', 'timestamp')} for c in comments])
+    return fixtures
+
+
+# =============================================================================
+# 세션 시나리오
+# =============================================================================
+def run_api_request(fetch, url: str):
+    """분석 버튼 1회: 수집 → 감성 분석 → 헤드라인 → 대표 댓글 → 검색 1회"""
+    video_info, comments = fetch(url, MAX_COMMENTS)
+    analysis = CommentAnalysis(video_info, comments)
+    analysis.keywords
+    analysis.factors
+    analysis.insight
+    analysis.ranking.top(3, 'positive')
+    analysis.ranking.top(3, 'negative')
+    analysis.search('최고 OR 재밌*')
+
+
+APP_SCRIPT = '''
+import streamlit_app
+from benchmarks.load_test import ACTIVE_FETCH
+streamlit_app.fetch_video_data = ACTIVE_FETCH
+streamlit_app.main()
+'''
+
+ACTIVE_FETCH = None
+
+
+def run_app_request(fetch, url: str):
+    """세션 1개: 첫 화면 → URL 입력 → 분석 시작 → 대표 댓글 펼치기"""
+    from streamlit.testing.v1 import AppTest
+    
+    at = AppTest.from_string(APP_SCRIPT, default_timeout=120).run()
+    at.text_input[0].input(url)
+    at.button[0].click().run()
+    at.toggle(key='show_representative').set_value(True).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+# =============================================================================
+# 측정
+# =============================================================================
+def rss_mb() -> float:
+    """현재 RSS (리눅스 /proc, 그 외에는 최대 RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run_level(mode: str, backend: ReplayBackend, fetch, concurrency: int, requests: int,
+              popularity: list, warm: bool) -> dict:
+    if not warm:
+        fetch.clear()
+        analyzer.clear_sentiment_cache()
+        tokenizer.stem.cache_clear()
+    backend.calls.clear()
+    before = analyzer.sentiment_cache_stats()
+    rss_before = rss_mb()
+    
+    video_ids = list(backend.fixtures)
+    plan = random.choices(video_ids, weights=popularity, k=requests)
+    run = run_api_request if mode == 'api' else run_app_request
+    latencies, errors = [], []
+    
+    def one(video_id):
+        start = time.perf_counter()
+        try:
+            run(fetch, f'https://www.youtube.com/watch?v={video_id}')
+        except Exception as e:
+            errors.append(repr(e))
+            return
+        latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, plan))
+    elapsed = time.perf_counter() - start
+    
+    after = analyzer.sentiment_cache_stats()
+    lookups = (after['hits'] - before['hits']) + (after['misses'] - before['misses'])
+    fetches = sum(backend.calls.values())
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 50) if latencies else 0.0,
+        'p95': percentile(latencies, 95) if latencies else 0.0,
+        'p99': percentile(latencies, 99) if latencies else 0.0,
+        'max': max(latencies) if latencies else 0.0,
+        'rss_growth': rss_mb() - rss_before,
+        'fetches': fetches,
+        'fetch_hit_rate': 1 - fetches / requests if requests else 0.0,
+        'duplicate_fetches': sum(n - 1 for n in backend.calls.values()),
+        'sentiment_hit_rate': (after['hits'] - before['hits']) / lookups if lookups else 0.0,
+    }
+
+
+def print_report(results: list):
+    print(f"{'동시':>4} {'요청':>5} {'오류':>4} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'RSS+MB':>7} {'수집':>5} {'중복수집':>8} {'수집캐시':>8} {'감성메모':>8}")
+    for r in results:
+        print(f"{r['concurrency']:>4} {r['requests']:>5} {r['errors']:>4} {r['throughput']:>7.1f} "
+              f"{r['p50'] * 1000:>8.1f} {r['p95'] * 1000:>8.1f} {r['p99'] * 1000:>8.1f} {r['max'] * 1000:>8.1f} "
+              f"{r['rss_growth']:>7.1f} {r['fetches']:>5} {r['duplicate_fetches']:>8} "
+              f"{r['fetch_hit_rate']:>8.1%} {r['sentiment_hit_rate']:>8.1%}")
+    for r in results:
+        if r['first_error']:
+            print(f"[동시 {r['concurrency']}] 첫 오류: {r['first_error']}")
+
+
+def main():
+    global ACTIVE_FETCH
+    
+    parser = argparse.ArgumentParser(description="유튜브 댓글 분석기 부하 테스트")
+    parser.add_argument('--mode', choices=['api', 'app'], default='api')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--requests', type=int, default=200, help="동시성 단계별 요청 수")
+    parser.add_argument('--videos', type=int, default=50, help="재생할 영상 수")
+    parser.add_argument('--comments', type=int, default=MAX_COMMENTS, help="합성 영상당 댓글 수")
+    parser.add_argument('--latency', type=float, default=300, help="수집 지연 (ms)")
+    parser.add_argument('--jitter', type=float, default=100, help="수집 지연 편차 (ms)")
+    parser.add_argument('--archive', help="합성 댓글 대신 이 댓글 아카이브의 영상을 재생")
+    parser.add_argument('--warm', action='store_true', help="단계 사이에 캐시를 비우지 않음")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    # app 모드 세션이 실제 요약/아카이브를 더럽히지 않도록 streamlit_app 을 import 하기 전에 경로를 돌린다
+    scratch = tempfile.mkdtemp(prefix='load_test_')
+    os.environ['SUMMARY_DIR'] = os.path.join(scratch, 'summaries')
+    os.environ['ARCHIVE_DIR'] = os.path.join(scratch, 'archive')
+    
+    # 스레드에서 cache_data / AppTest 를 쓸 때 나오는 런타임 없음 경고는 숨긴다
+    st_logger.set_log_level('error')
+    random.seed(args.seed)
+    if args.archive:
+        fixtures = archive_fixtures(args.archive, args.videos)
+    else:
+        fixtures = synthetic_fixtures(args.videos, args.comments, args.seed)
+    if not fixtures:
+        parser.error("재생할 영상이 없습니다.")
+    
+    backend = ReplayBackend(fixtures, args.latency, args.jitter)
+    
+    # 앱과 같은 캐시 설정으로 감싼다 (streamlit_app.fetch_video_data 참고)
+    @st.cache_data(ttl=1800, show_spinner=False)
+    def replay_fetch(url: str, max_comments: int):
+        return backend.fetch(url, max_comments)
+    
+    ACTIVE_FETCH = replay_fetch
+    sys.modules.setdefault('benchmarks.load_test', sys.modules[__name__])
+    
+    # 인기 영상에 요청이 몰리는 분포 (순위의 역수)
+    popularity = [1 / (rank + 1) for rank in range(len(fixtures))]
+    
+    print(f"모드 {args.mode}, 영상 {len(fixtures)}개, 수집 지연 {args.latency:.0f}±{args.jitter:.0f}ms, "
+          f"{'웜' if args.warm else '콜드'} 캐시로 단계 시작")
+    try:
+        results = [
+            run_level(args.mode, backend, replay_fetch, n, args.requests, popularity, args.warm)
+            for n in args.concurrency
+        ]
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
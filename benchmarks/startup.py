@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+콜드 스타트 벤치마크
+====================
+- 모듈 import 시간 (새 프로세스에서 측정, streamlit 자체 import 시간과 분리)
+- import 직후 무거운 모듈(pandas/matplotlib/wordcloud) 로드 여부
+- 첫 렌더링까지 걸리는 시간 (streamlit.testing AppTest)
+
+사용법: python benchmarks/startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'streamlit_app.py')
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib', 'wordcloud', 'PIL']
+
+# 새 인터프리터에서 실행할 측정 코드
+IMPORT_PROBE = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import streamlit
+t1 = time.perf_counter()
+import streamlit_app
+t2 = time.perf_counter()
+print(json.dumps({{
+    'streamlit': t1 - t0,
+    'app': t2 - t1,
+    'loaded': [m for m in {heavy!r} if m in sys.modules],
+}}))
+'''
+
+RENDER_PROBE = '''
+import json, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60)
+at.run()
+t1 = time.perf_counter()
+print(json.dumps({{'first_render': t1 - t0, 'exception': bool(at.exception)}}))
+'''
+
+
+def run_probe(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(values: list) -> str:
+    values = [v * 1000 for v in values]
+    return f"median {statistics.median(values):8.1f} ms  (min {min(values):.1f}, max {max(values):.1f})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유튜브 댓글 분석기 콜드 스타트 벤치마크")
+    parser.add_argument('--runs', type=int, default=5, help="반복 횟수 (매번 새 프로세스)")
+    args = parser.parse_args()
+    
+    imports = [run_probe(IMPORT_PROBE.format(root=ROOT, heavy=HEAVY_MODULES)) for _ in range(args.runs)]
+    renders = [run_probe(RENDER_PROBE.format(app=APP_PATH)) for _ in range(args.runs)]
+    
+    print(f"import streamlit      : {summarize([r['streamlit'] for r in imports])}")
+    print(f"import streamlit_app  : {summarize([r['app'] for r in imports])}")
+    print(f"first render (AppTest): {summarize([r['first_render'] for r in renders])}")
+    print(f"heavy modules loaded at import: {', '.join(imports[-1]['loaded']) or '없음'}")
+    if any(r['exception'] for r in renders):
+        print("경고: 첫 렌더링 중 예외가 발생했습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,29 +9,32 @@
 """
 
 import streamlit as st
-import pandas as pd
 import re
-import matplotlib.pyplot as plt
-from collections import Counter
-from wordcloud import WordCloud
-import urllib.request
-import os
+import time
+
+from analyzer import FACTOR_GROUPS, SAMPLE_MIN_COMMENTS, CommentAnalysis, SentimentEstimate
+from summary import SUMMARY_MAX_AGE, AnalysisSummary, SummaryStore, build_rollup
 
 # =============================================================================
 # 설정
 # =============================================================================
 MAX_COMMENTS = 500
+APPROX_MAX_COMMENTS = 100_000  # 근사 분석 모드에서 수집하는 최대 댓글 수
+APPROX_ARCHIVE_MAX_AGE = 24 * 3600  # 근사 분석에 재사용할 아카이브 스냅샷의 최대 나이 (초)
+ESTIMATE_REFRESH = 1.0  # 근사 결과 갱신 주기 (초)
+MAX_VIDEOS = 50      # 채널/재생목록 모드에서 분석할 최근 영상 수
+MODE_VIDEO = "영상"
+MODE_CHANNEL = "채널/재생목록"
+REP_PAGE_SIZE = 3    # 대표 댓글 기본 표시 개수
+REP_MORE_SIZE = 10   # '더 보기' 한 번에 추가되는 개수
+SEARCH_LIMIT = 20    # 검색 결과 표시 개수
+SENTIMENT_FILTERS = {'전체': None, '긍정': 'positive', '중립': 'neutral', '부정': 'negative'}
 
-st.set_page_config(
-    page_title="유튜브 댓글 분석기",
-    page_icon="📊",
-    layout="wide"
-)
 
 # =============================================================================
 # Claude 스타일 CSS
 # =============================================================================
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;600&display=swap');
     
@@ -275,188 +278,17 @@ st.markdown("""
         background: #333;
     }
 </style>
-""", unsafe_allow_html=True)
-
-# =============================================================================
-# 감성 분석 (맥락 기반 개선)
-# =============================================================================
-
-# 긍정 표현
-POSITIVE_EXPRESSIONS = {
-    '좋아', '좋다', '좋네', '좋은', '좋았', '좋음',
-    '최고', '대박', '멋지', '멋져', '멋있', '예쁘', '예뻐', '이쁘', '이뻐',
-    '귀엽', '귀여', '사랑', '감사', '고마', '행복', '기쁘', '즐거',
-    '훌륭', '완벽', '감동', '재밌', '재미있', '웃기', '웃겨', '힐링',
-    '짱', '쩔어', '쩐다', '미쳤', '대단', '놀랍', '신기',
-    '레전드', '갓', '인정', '추천', '천재', '역시', '찐',
-    '꿀잼', '핵잼', '존잼', '킬링', '중독', '센스',
-    '소화', '매력', '찰떡', '어울려', '어울리', '퀄리티',
-    'good', 'great', 'best', 'love', 'amazing', 'awesome', 'perfect', 'wow',
-}
-
-# 부정 표현
-NEGATIVE_EXPRESSIONS = {
-    '싫어', '싫다', '별로', '최악', '실망', '짜증', '화나', '열받',
-    '답답', '불쾌', '불편', '슬프', '슬퍼', '우울',
-    '지루', '노잼', '재미없', '못생', '쓰레기', '망했', '폭망',
-    '극혐', '혐오', '역겹', '비추', '후회', '아깝',
-    'bad', 'worst', 'hate', 'terrible', 'boring', 'trash', 'cringe',
-}
-
-# 부정 전환 패턴 (긍정어 + 이 패턴 = 부정)
-NEGATION_PATTERNS = [
-    r'재미\s*없', r'재밌지\s*않', r'좋지\s*않', r'좋은\s*거\s*없',
-    r'별로', r'아닌', r'아니', r'없어', r'없다', r'없네', r'없음',
-    r'못\s*하', r'안\s*좋', r'글쎄', r'싫',
-]
-
-# 아이러니/반어 패턴 (웃음 + 부정 맥락)
-IRONY_NEGATIVE_PATTERNS = [
-    r'어이없', r'황당', r'기가\s*막', r'할말없', r'말문이', r'헛웃음',
-    r'웃프', r'웃기지도\s*않', r'피식', r'실소', r'냉소',
-    r'뭐지', r'뭐야', r'왜이래', r'왜이러',
-]
-
-# 긍정적 욕설 패턴 (욕설이지만 긍정 맥락)
-POSITIVE_SWEAR_CONTEXT = [
-    r'미친\s*(연기|실력|퀄|비주얼|텐션|센스)',
-    r'개\s*(잘|멋|예쁘|귀엽|웃기)',
-    r'ㅅㅂ.{0,10}(좋|최고|대박|미쳤|쩔)',
-    r'(좋|최고|대박|미쳤|쩔).{0,10}ㅅㅂ',
-    r'씨발.{0,10}(좋|최고|대박)',
-]
-
-POSITIVE_EMOJIS = set('😀😃😄😁😆😅🤣😂😊😇🥰😍🤩😘👍👏🙌💪✨🌟⭐💖💗❤🔥💯🎉👑💎🏆😎🤗🥳')
-NEGATIVE_EMOJIS = set('😢😭😤😠😡🤬💔👎🙄😒😞😔😟😣😖😫😩😱🤮🤢')
-
-
-def analyze_sentiment(text: str) -> tuple:
-    """
-    맥락 기반 감성 분석
-    1. 부정 전환 패턴 체크 (재미없어 ㅋㅋㅋ → 부정)
-    2. 긍정적 욕설 패턴 체크 (미친 연기력 → 긍정)
-    3. 아이러니 패턴 체크 (어이없어서 웃음 → 부정)
-    4. 기본 키워드 분석
-    """
-    if not text:
-        return 'neutral', 0.0
-    
-    text_lower = text.lower()
-    score = 0.0
-    
-    # === 1단계: 부정 전환 패턴 체크 ===
-    for pattern in NEGATION_PATTERNS:
-        if re.search(pattern, text_lower):
-            score -= 0.8
-            break
-    
-    # === 2단계: 아이러니/반어 패턴 ===
-    for pattern in IRONY_NEGATIVE_PATTERNS:
-        if re.search(pattern, text_lower):
-            score -= 0.6
-            break
-    
-    # === 3단계: 긍정적 욕설 컨텍스트 ===
-    for pattern in POSITIVE_SWEAR_CONTEXT:
-        if re.search(pattern, text_lower):
-            score += 1.0
-            break
-    
-    # === 4단계: 이모지 분석 ===
-    pos_emoji = sum(1 for e in POSITIVE_EMOJIS if e in text)
-    neg_emoji = sum(1 for e in NEGATIVE_EMOJIS if e in text)
-    score += (pos_emoji - neg_emoji) * 0.2
-    
-    # === 5단계: 키워드 분석 ===
-    words = re.findall(r'[가-힣]+|[a-zA-Z]+', text_lower)
-    
-    pos_count = 0
-    neg_count = 0
-    
-    for word in words:
-        if any(p in word for p in POSITIVE_EXPRESSIONS):
-            pos_count += 1
-        if any(n in word for n in NEGATIVE_EXPRESSIONS):
-            neg_count += 1
-    
-    # 부정 전환 패턴이 없을 때만 긍정 점수 부여
-    if score >= 0:  
-        score += pos_count * 0.3
-    score -= neg_count * 0.4
-    
-    # === 6단계: 웃음 표현 (맥락에 따라) ===
-    laugh = len(re.findall(r'ㅋ{2,}|ㅎ{2,}', text))
-    if laugh > 0:
-        # 부정 맥락이 없으면 긍정, 있으면 중립 유지
-        if score >= 0:
-            score += laugh * 0.2
-        # 부정 맥락 + 웃음 = 비꼼이므로 점수 유지
-    
-    # === 7단계: 최종 판정 ===
-    if score >= 0.4:
-        return 'positive', score
-    elif score <= -0.4:
-        return 'negative', score
-    return 'neutral', score
+"""
 
 
-# =============================================================================
-# 핵심 요인 분석
-# =============================================================================
-def analyze_factors(comments_df: pd.DataFrame) -> dict:
-    """긍정/부정 핵심 요인 분석"""
-    
-    pos_df = comments_df[comments_df['sentiment'] == 'positive']
-    neg_df = comments_df[comments_df['sentiment'] == 'negative']
-    
-    # 긍정 요인 키워드 그룹
-    positive_factor_groups = {
-        '재미/유머': ['재밌', '웃기', '웃겨', '꿀잼', '핵잼', '유머', '센스', '킬링'],
-        '퀄리티/완성도': ['퀄리티', '완성도', '대박', '미쳤', '쩐다', '레전드'],
-        '출연자/비주얼': ['예쁘', '이쁘', '잘생', '비주얼', '매력', '귀엽', '귀여'],
-        '감동/공감': ['감동', '눈물', '울컥', '공감', '힐링', '따뜻'],
-        '기대/응원': ['기대', '응원', '화이팅', '파이팅', '사랑'],
-    }
-    
-    # 부정 요인 키워드 그룹
-    negative_factor_groups = {
-        '지루/재미없음': ['지루', '노잼', '재미없', '별로', '심심'],
-        '실망/기대이하': ['실망', '아쉽', '기대이하', '별로'],
-        '불편/불쾌': ['불편', '불쾌', '짜증', '화나', '열받'],
-        '퀄리티 문제': ['조잡', '대충', '못', '최악', '망'],
-        '광고/상업성': ['광고', '협찬', '뻔한', '돈'],
-    }
-    
-    results = {'positive': [], 'negative': []}
-    
-    # 긍정 요인 분석
-    if len(pos_df) > 0:
-        pos_text = ' '.join(pos_df['text'].tolist()).lower()
-        factor_scores = {}
-        
-        for factor, keywords in positive_factor_groups.items():
-            count = sum(pos_text.count(kw) for kw in keywords)
-            if count > 0:
-                factor_scores[factor] = count
-        
-        # 상위 3개 요인
-        sorted_factors = sorted(factor_scores.items(), key=lambda x: -x[1])
-        results['positive'] = [f for f, _ in sorted_factors[:3]]
-    
-    # 부정 요인 분석
-    if len(neg_df) > 0:
-        neg_text = ' '.join(neg_df['text'].tolist()).lower()
-        factor_scores = {}
-        
-        for factor, keywords in negative_factor_groups.items():
-            count = sum(neg_text.count(kw) for kw in keywords)
-            if count > 0:
-                factor_scores[factor] = count
-        
-        sorted_factors = sorted(factor_scores.items(), key=lambda x: -x[1])
-        results['negative'] = [f for f, _ in sorted_factors[:3]]
-    
-    return results
+def setup_page():
+    """페이지 설정 및 CSS 적용 (Streamlit 은 매 실행마다 요소를 다시 그려야 하므로 main 에서 호출)"""
+    st.set_page_config(
+        page_title="유튜브 댓글 분석기",
+        page_icon="📊",
+        layout="wide"
+    )
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 
 # =============================================================================
@@ -476,6 +308,13 @@ def extract_video_id(url: str) -> str:
     return url if re.match(r'^[a-zA-Z0-9_-]{11}$', url) else None
 
 
+def is_collection_url(url: str) -> bool:
+    """재생목록(list=) 또는 채널(@handle, /channel/, /c/, /user/) URL 여부"""
+    if not url:
+        return False
+    return bool(re.search(r'[?&]list=[a-zA-Z0-9_-]+|youtube\.com/(@[^/?#]+|channel/|c/|user/)', url))
+
+
 def format_date(date_str: str) -> str:
     if not date_str or len(date_str) != 8:
         return "정보 없음"
@@ -496,118 +335,6 @@ def format_number(num) -> str:
         return "0"
 
 
-STOPWORDS = {'은', '는', '이', '가', '을', '를', '에', '에서', '의', '와', '과', '도', '만', '로', '으로',
-             '하고', '그리고', '그런데', '하지만', '그래서', '또', '더', '막', '좀', '이제', '진짜', '너무', '정말', '완전',
-             '것', '거', '수', '때', '중', '년', '월', '일', '번', '분', '게', '데', '뭐', '왜', '어떻게',
-             '나', '너', '우리', '저', '영상', '댓글', '유튜브', '채널', '구독', '좋아요', '시청',
-             'the', 'a', 'an', 'is', 'are', 'to', 'of', 'in', 'for', 'on', 'with', 'this', 'that',
-             'i', 'you', 'it', 'and', 'but', 'or', 'so', 'video', 'comment', 'like', 'just'}
-
-
-def extract_keywords(texts: list, top_n: int = 10) -> list:
-    words = []
-    for text in texts:
-        if not text:
-            continue
-        text = re.sub(r'http\S+', '', text.lower())
-        text = re.sub(r'[^\w\s가-힣]', ' ', text)
-        tokens = text.split()
-        words.extend([t for t in tokens if t not in STOPWORDS and len(t) > 1])
-    
-    return Counter(words).most_common(top_n)
-
-
-def get_korean_font_path():
-    """한글 폰트 다운로드 및 경로 반환"""
-    font_path = '/tmp/NanumGothic.ttf'
-    
-    if not os.path.exists(font_path):
-        try:
-            # 나눔고딕 폰트 다운로드
-            url = 'https://github.com/naver/nanumfont/releases/download/VER2.5/NanumGothic.ttf'
-            urllib.request.urlretrieve(url, font_path)
-        except:
-            # 백업: 구글 폰트
-            try:
-                url = 'https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Regular.ttf'
-                urllib.request.urlretrieve(url, font_path)
-            except:
-                return None
-    
-    return font_path
-
-
-def generate_wordcloud(texts: list):
-    """워드 클라우드 생성"""
-    # 텍스트 전처리
-    all_words = []
-    for text in texts:
-        if not text:
-            continue
-        text = re.sub(r'http\S+', '', text.lower())
-        text = re.sub(r'[^\w\s가-힣]', ' ', text)
-        tokens = text.split()
-        all_words.extend([t for t in tokens if t not in STOPWORDS and len(t) > 1])
-    
-    if not all_words:
-        return None
-    
-    word_freq = Counter(all_words)
-    
-    # 폰트 경로
-    font_path = get_korean_font_path()
-    
-    if not font_path or not os.path.exists(font_path):
-        return None
-    
-    # 워드 클라우드 생성
-    wc = WordCloud(
-        font_path=font_path,
-        width=800,
-        height=400,
-        background_color='white',
-        colormap='copper',  # 브라운 톤 컬러맵
-        max_words=50,
-        prefer_horizontal=0.7,
-        min_font_size=12,
-        max_font_size=100,
-    )
-    
-    wc.generate_from_frequencies(word_freq)
-    
-    return wc
-
-
-def generate_insight(video_info, pos_pct, neg_pct, factors, keywords) -> str:
-    insights = []
-    
-    # 전반적 반응
-    if pos_pct >= 70:
-        insights.append(f"시청자 반응이 매우 긍정적입니다(긍정 {pos_pct:.0f}%). 바이럴 가능성이 높고, 시리즈화나 유사 콘텐츠 기획이 유효합니다.")
-    elif pos_pct >= 50:
-        insights.append(f"전반적으로 호의적인 반응입니다(긍정 {pos_pct:.0f}%). 개선 포인트를 파악하면 더 높은 만족도를 이끌어낼 수 있습니다.")
-    elif neg_pct >= 30:
-        insights.append(f"부정적 반응이 상당합니다(부정 {neg_pct:.0f}%). 핵심 불만 요인을 파악하고 대응이 필요합니다.")
-    else:
-        insights.append(f"반응이 혼재되어 있습니다. 긍정과 부정 요인을 모두 분석해볼 필요가 있습니다.")
-    
-    # 핵심 요인 기반
-    if factors.get('positive'):
-        top_factor = factors['positive'][0]
-        insights.append(f"긍정 반응의 핵심은 '{top_factor}'입니다. 이 강점을 유지하거나 강화하세요.")
-    
-    if factors.get('negative'):
-        top_factor = factors['negative'][0]
-        insights.append(f"부정 반응의 주요 원인은 '{top_factor}'로 보입니다. 개선 또는 해명이 도움이 될 수 있습니다.")
-    
-    # 키워드 기반
-    if keywords:
-        top_kw = keywords[0][0]
-        insights.append(f"가장 많이 언급된 '{top_kw}'를 중심으로 후속 콘텐츠를 기획해보세요.")
-    
-    return " ".join(insights)
-
-
 # =============================================================================
 # 데이터 수집
 # =============================================================================
@@ -641,6 +368,7 @@ def fetch_video_data(url: str, max_comments: int):
             'view_count': info.get('view_count', 0),
             'like_count': info.get('like_count', 0),
             'total_comments': info.get('comment_count', 0),
+            'fetched_at': int(time.time()),
         }
         
         raw_comments = info.get('comments') or []
@@ -650,15 +378,445 @@ def fetch_video_data(url: str, max_comments: int):
                 comments.append({
                     'text': c.get('text', ''),
                     'likes': c.get('like_count', 0) or 0,
+                    'timestamp': c.get('timestamp'),
                 })
         
         return video_info, comments
 
 
+@st.cache_data(ttl=1800, show_spinner=False)
+def fetch_playlist_entries(url: str, max_videos: int):
+    """채널/재생목록의 영상 id 목록 (최근 순, 댓글은 가져오지 않음)"""
+    import yt_dlp
+    
+    # 채널 홈은 탭 목록만 돌려주므로 동영상 탭으로 이동
+    if not re.search(r'[?&]list=', url) and not re.search(r'/(videos|shorts|streams)/?$', url):
+        url = url.rstrip('/') + '/videos'
+    
+    opts = {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': 'in_playlist',
+        'playlistend': max_videos,
+    }
+    
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+        
+        if not info:
+            return None, []
+        
+        playlist_info = {
+            'id': info.get('id') or url,
+            'title': info.get('title', '제목 없음'),
+            'channel': info.get('channel', info.get('uploader', '채널 정보 없음')),
+        }
+        
+        video_ids = []
+        for entry in info.get('entries') or []:
+            if entry and re.match(r'^[a-zA-Z0-9_-]{11}$', entry.get('id') or ''):
+                video_ids.append(entry['id'])
+        
+        return playlist_info, video_ids[:max_videos]
+
+
+@st.cache_resource(show_spinner=False)
+def get_archive():
+    """댓글 아카이브 (프로세스 공유, numpy 는 처음 쓸 때 import)"""
+    from archive import CommentArchive
+    
+    return CommentArchive()
+
+
+def archive_comments(video_id: str, analysis: CommentAnalysis):
+    """수집한 댓글을 아카이브에 보관 (같은 수집 결과는 다시 넣지 않음)"""
+    archive = get_archive()
+    snapshot = archive.get(video_id)
+    if (snapshot and snapshot['count'] == analysis.total
+            and snapshot['video_info'].get('fetched_at') == analysis.video_info.get('fetched_at')):
+        return
+    archive.append(video_id, analysis.comments, analysis.video_info)
+
+
 # =============================================================================
 # 메인 앱
 # =============================================================================
+def reset_rep_limit():
+    st.session_state['rep_limit'] = REP_PAGE_SIZE
+
+
+def show_more_representative():
+    st.session_state['rep_limit'] = st.session_state.get('rep_limit', REP_PAGE_SIZE) + REP_MORE_SIZE
+
+
+def render_comment(comment: dict, css_class: str, max_len: int, prefix: str = ''):
+    text = comment['text'][:max_len] + ('...' if len(comment['text']) > max_len else '')
+    st.markdown(f'''
+    <div class="comment-item {css_class}">
+        <div class="comment-text">{prefix}{text}</div>
+        <div class="comment-meta">좋아요 {int(comment["likes"]):,}</div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+
+def render_factor_box(title: str, factors: list, empty_text: str):
+    st.markdown(f'''
+    <div class="factor-box">
+        <div class="factor-title">{title}</div>
+        <div class="factor-desc">{', '.join(factors) if factors else empty_text}</div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+
+def render_video_info(video_info: dict, analyzed: str):
+    st.markdown('<div class="section-title">영상 정보</div>', unsafe_allow_html=True)
+    st.markdown(f'''
+    <div class="card">
+        <div class="video-title">{video_info.get("title", "")}</div>
+        <div class="video-meta">
+            <span class="video-meta-item">👤 {video_info.get("channel", "")}</span>
+            <span class="video-meta-item">📅 {video_info.get("upload_date", "")}</span>
+            <span class="video-meta-item">👁 {format_number(video_info.get("view_count", 0))}</span>
+            <span class="video-meta-item">💬 {format_number(video_info.get("total_comments", 0))}개 중 {analyzed}</span>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+
+def render_sentiment_bar(pos_pct: float, neu_pct: float, neg_pct: float, margins: dict = None):
+    """margins: 근사 분석일 때 감성별 오차 (±%p)"""
+    margins = {k: f' ±{m:.1f}' for k, m in margins.items()} if margins else {}
+    st.markdown('<div class="section-title">감성 분석</div>', unsafe_allow_html=True)
+    st.markdown(f'''
+    <div class="card">
+        <div class="sentiment-bar">
+            <div class="sentiment-pos" style="width:{pos_pct}%"></div>
+            <div class="sentiment-neu" style="width:{neu_pct}%"></div>
+            <div class="sentiment-neg" style="width:{neg_pct}%"></div>
+        </div>
+        <div class="sentiment-labels">
+            <span class="sentiment-label"><span class="dot dot-pos"></span> 긍정 {pos_pct:.1f}%{margins.get('positive', '')}</span>
+            <span class="sentiment-label"><span class="dot dot-neu"></span> 중립 {neu_pct:.1f}%{margins.get('neutral', '')}</span>
+            <span class="sentiment-label"><span class="dot dot-neg"></span> 부정 {neg_pct:.1f}%{margins.get('negative', '')}</span>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+
+def render_keywords(keywords: list):
+    st.markdown('<div class="section-title">주요 키워드</div>', unsafe_allow_html=True)
+    kw_html = ' '.join([f'<span class="keyword-tag"><strong>{kw}</strong> {cnt}</span>' for kw, cnt in keywords[:8]])
+    st.markdown(f'<div class="card"><div class="keyword-list">{kw_html}</div></div>', unsafe_allow_html=True)
+
+
+def render_factors(factors: dict):
+    st.markdown('<div class="section-title">핵심 요인 분석</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        render_factor_box("😊 긍정 반응 핵심 요인", factors['positive'], "분석된 요인 없음")
+    with col2:
+        render_factor_box("😞 부정 반응 핵심 요인", factors['negative'], "부정 댓글이 거의 없습니다")
+
+
+def render_insight(insight: str):
+    st.markdown('<div class="section-title">종합 인사이트</div>', unsafe_allow_html=True)
+    st.markdown(f'''
+    <div class="insight-box">
+        <div class="insight-title">💡 분석 요약</div>
+        <div class="insight-text">{insight}</div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+
+def render_results(analysis: CommentAnalysis):
+    """
+    분석 결과 출력
+    - 헤드라인(영상 정보, 감성 비율, 키워드, 요인, 인사이트)은 항상 출력
+    - 워드 클라우드 / 대표 댓글 / 타임라인은 펼쳤을 때만 계산 (CommentAnalysis 에 캐시)
+    """
+    # 영상 정보
+    render_video_info(analysis.video_info, f"{analysis.total:,}개 분석")
+    
+    # 감성 분석
+    render_sentiment_bar(analysis.pos_pct, analysis.neu_pct, analysis.neg_pct)
+    
+    # 키워드
+    render_keywords(analysis.keywords)
+    
+    # 워드 클라우드
+    st.markdown('<div class="section-title">워드 클라우드</div>', unsafe_allow_html=True)
+    if st.toggle("워드 클라우드 보기", key="show_wordcloud"):
+        with st.spinner("워드 클라우드 생성 중..."):
+            image = analysis.wordcloud
+        
+        if image is not None:
+            st.image(image)
+        else:
+            st.info("워드 클라우드를 생성할 수 없습니다.")
+    
+    # 핵심 요인
+    render_factors(analysis.factors)
+    
+    # 대표 댓글
+    st.markdown('<div class="section-title">대표 댓글</div>', unsafe_allow_html=True)
+    if st.toggle("대표 댓글 보기", key="show_representative"):
+        ranking = analysis.ranking
+        limit = st.session_state.setdefault('rep_limit', REP_PAGE_SIZE)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            factor = st.selectbox("요인 필터", ['전체'] + list(FACTOR_GROUPS), key="rep_factor", on_change=reset_rep_limit)
+        with col2:
+            keyword = st.text_input("키워드 필터", key="rep_keyword", on_change=reset_rep_limit).strip()
+        factor = None if factor == '전체' else factor
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown('<div class="comment-section-title">👍 긍정 댓글</div>', unsafe_allow_html=True)
+            pos_comments = ranking.top(limit, 'positive', factor=factor, keyword=keyword)
+            for c in pos_comments:
+                render_comment(c, 'positive', 100)
+            if not pos_comments:
+                st.markdown('<div class="comment-item">긍정 댓글 없음</div>', unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown('<div class="comment-section-title">👎 부정 댓글</div>', unsafe_allow_html=True)
+            neg_comments = ranking.top(limit, 'negative', factor=factor, keyword=keyword)
+            for c in neg_comments:
+                render_comment(c, 'negative', 100)
+            if not neg_comments:
+                st.markdown('<div class="comment-item">부정 댓글이 거의 없습니다 🎉</div>', unsafe_allow_html=True)
+        
+        remaining = max(ranking.count('positive', factor, keyword), ranking.count('negative', factor, keyword))
+        if remaining > limit:
+            st.button("더 보기", key="rep_more", on_click=show_more_representative)
+        
+        # 베스트 댓글
+        st.markdown('<div class="section-title">베스트 댓글 TOP 5</div>', unsafe_allow_html=True)
+        for i, c in enumerate(ranking.top(5), 1):
+            render_comment(c, 'best', 120, prefix=f'<strong>#{i}</strong> ')
+    
+    # 댓글 검색
+    st.markdown('<div class="section-title">댓글 검색</div>', unsafe_allow_html=True)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input(
+            "검색어",
+            key="search_query",
+            placeholder="예) 연기 OR 노래, 재밌*, 노래 -광고",
+            help="공백은 AND, OR 은 또는, -단어 는 제외, 단어* 는 접두어 검색",
+        )
+    with col2:
+        sentiment_label = st.selectbox("감성", list(SENTIMENT_FILTERS), key="search_sentiment")
+    
+    if query.strip():
+        sentiment = SENTIMENT_FILTERS[sentiment_label]
+        results = analysis.search(query, sentiment, limit=SEARCH_LIMIT)
+        st.caption(f"{analysis.search_index.count(query, sentiment):,}개 댓글 (좋아요 순 상위 {len(results)}개 표시)")
+        for c in results:
+            render_comment(c, c['sentiment'], 200)
+        if not results:
+            st.markdown('<div class="comment-item">검색 결과가 없습니다</div>', unsafe_allow_html=True)
+    
+    # 타임라인
+    st.markdown('<div class="section-title">작성일별 반응</div>', unsafe_allow_html=True)
+    if st.toggle("타임라인 보기", key="show_timeline"):
+        timeline = analysis.timeline
+        if timeline is not None:
+            st.bar_chart(timeline)
+        else:
+            st.info("댓글 작성 시각 정보가 없습니다.")
+    
+    # 종합 인사이트
+    render_insight(analysis.insight)
+    
+    # 푸터
+    st.markdown('<div class="footer">유튜브 댓글 분석기 v2.0</div>', unsafe_allow_html=True)
+
+
+def render_estimate(estimate: SentimentEstimate):
+    """근사 결과 (영상 정보, 오차 범위가 붙은 감성 비율, 판정 진행률)"""
+    render_video_info(estimate.video_info, f"{estimate.total:,}개 수집 · {estimate.processed:,}개 표본")
+    
+    result = estimate.estimate()
+    render_sentiment_bar(
+        result['positive'][0], result['neutral'][0], result['negative'][0],
+        margins={sentiment: margin for sentiment, (_, margin) in result.items()},
+    )
+    st.progress(
+        estimate.processed / estimate.total,
+        text=f"근사 결과 (95% 신뢰) · 나머지 댓글을 판정하는 중... {estimate.processed:,} / {estimate.total:,}",
+    )
+
+
+def live_estimate():
+    """근사 결과를 주기적으로 갱신하고, 전수 판정이 끝나면 전체 결과로 전환"""
+    estimate = st.session_state.get('estimate')
+    if estimate is None:
+        return
+    if estimate.done:
+        video_id = st.session_state.pop('estimate_video_id')
+        del st.session_state['estimate']
+        analysis = estimate.analysis()
+        st.session_state['analysis'] = analysis
+        save_analysis(video_id, analysis)
+        st.rerun()
+    render_estimate(estimate)
+
+
+if hasattr(st, 'fragment'):
+    # 근사 결과 부분만 주기적으로 다시 그린다 (streamlit 1.37+)
+    live_estimate = st.fragment(run_every=ESTIMATE_REFRESH)(live_estimate)
+
+
+def render_rollup(playlist_info: dict, rollup: AnalysisSummary):
+    """채널/재생목록 롤업 출력 (영상 요약을 합친 결과)"""
+    
+    # 채널 정보
+    st.markdown('<div class="section-title">채널 정보</div>', unsafe_allow_html=True)
+    st.markdown(f'''
+    <div class="card">
+        <div class="video-title">{playlist_info.get("title", "")}</div>
+        <div class="video-meta">
+            <span class="video-meta-item">👤 {playlist_info.get("channel", "")}</span>
+            <span class="video-meta-item">🎬 영상 {len(rollup.videos)}개</span>
+            <span class="video-meta-item">💬 댓글 {format_number(rollup.total)}개 분석</span>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    # 감성 분석 / 키워드 / 핵심 요인
+    render_sentiment_bar(rollup.pct('positive'), rollup.pct('neutral'), rollup.pct('negative'))
+    render_keywords(rollup.top_keywords())
+    render_factors(rollup.top_factors())
+    
+    # 영상별 반응
+    st.markdown('<div class="section-title">영상별 반응</div>', unsafe_allow_html=True)
+    st.dataframe([
+        {
+            '제목': v['title'],
+            '분석 댓글': v['total'],
+            '긍정 %': round(v['positive'] / v['total'] * 100, 1) if v['total'] else 0.0,
+            '부정 %': round(v['negative'] / v['total'] * 100, 1) if v['total'] else 0.0,
+        }
+        for v in rollup.videos.values()
+    ], use_container_width=True, hide_index=True)
+    
+    # 베스트 댓글
+    st.markdown('<div class="section-title">채널 베스트 댓글 TOP 5</div>', unsafe_allow_html=True)
+    for i, c in enumerate(rollup.top_comments['best'][:5], 1):
+        render_comment(c, 'best', 120, prefix=f'<strong>#{i}</strong> ')
+    
+    # 종합 인사이트
+    render_insight(rollup.insight(playlist_info.get('title', '')))
+    
+    # 푸터
+    st.markdown('<div class="footer">유튜브 댓글 분석기 v2.0</div>', unsafe_allow_html=True)
+
+
+def save_analysis(video_id: str, analysis: CommentAnalysis):
+    """
+    채널 롤업·재분석에서 재사용할 수 있도록 영상 요약과 댓글 보관
+    - 댓글은 수집한 만큼 모두 아카이브
+    - 영상 요약은 analyze_video_summary 와 같은 기준(좋아요 상위 MAX_COMMENTS 개)으로
+      → 근사 모드로 10만 개를 분석한 영상이 롤업에서 다른 영상보다 크게 잡히지 않도록
+    """
+    summary_analysis = analysis
+    if analysis.total > MAX_COMMENTS:
+        summary_analysis = CommentAnalysis(analysis.video_info, analysis.ranking.top(MAX_COMMENTS), scored=True)
+    SummaryStore().save(video_id, AnalysisSummary.from_analysis(video_id, summary_analysis))
+    archive_comments(video_id, analysis)
+
+
+def load_comments(video_id: str, url: str, approximate: bool):
+    """
+    (영상 정보, 댓글)
+    - 근사 모드는 APPROX_MAX_COMMENTS 개까지 수집
+    - 단, 근사 분석할 만큼 큰 (SAMPLE_MIN_COMMENTS 이상) 최근 아카이브 스냅샷이 있으면 재수집 없이 디스크에서
+      (일반 분석이 남긴 MAX_COMMENTS 개짜리 스냅샷이나 오래된 스냅샷은 쓰지 않는다)
+    """
+    if not approximate:
+        return fetch_video_data(url, MAX_COMMENTS)
+    archive = get_archive()
+    snapshot = archive.get(video_id)
+    if (snapshot and snapshot['count'] >= SAMPLE_MIN_COMMENTS
+            and time.time() - snapshot['archived_at'] <= APPROX_ARCHIVE_MAX_AGE):
+        return archive.load(video_id)
+    return fetch_video_data(url, APPROX_MAX_COMMENTS)
+
+
+def analyze_video_summary(video_id: str):
+    """
+    영상 1개 요약 생성 (비공개/삭제 영상 등은 None)
+    - 최근 아카이브가 있으면 재수집 없이 디스크에서
+    - 근사 모드로 많이 보관된 영상도 좋아요 상위 MAX_COMMENTS 개만 써서 롤업 안의 영상 비중을 맞춘다
+    """
+    archive = get_archive()
+    snapshot = archive.get(video_id)
+    if snapshot and time.time() - snapshot['archived_at'] <= SUMMARY_MAX_AGE:
+        return AnalysisSummary.from_analysis(video_id, archive.analysis(video_id, MAX_COMMENTS))
+    
+    try:
+        video_info, comments = fetch_video_data(f'https://www.youtube.com/watch?v={video_id}', MAX_COMMENTS)
+    except Exception:
+        return None
+    if not video_info or not comments:
+        return None
+    
+    analysis = CommentAnalysis(video_info, comments)
+    archive_comments(video_id, analysis)
+    return AnalysisSummary.from_analysis(video_id, analysis)
+
+
+def channel_main(url: str):
+    """채널/재생목록 모드: 영상 요약을 병합해 롤업 (이미 분석한 영상은 저장된 요약 재사용)"""
+    st.markdown(f'<div class="notice">💡 최근 영상 최대 {MAX_VIDEOS}개, 영상당 인기 댓글 최대 {MAX_COMMENTS}개를 분석합니다. 이미 분석한 영상은 저장된 결과를 사용합니다.</div>', unsafe_allow_html=True)
+    
+    if st.button("분석 시작", key="channel_start", use_container_width=True):
+        if not is_collection_url(url):
+            st.error("채널 또는 재생목록 URL을 입력해주세요.")
+            return
+        
+        try:
+            with st.spinner("영상 목록을 가져오고 있습니다..."):
+                playlist_info, video_ids = fetch_playlist_entries(url, MAX_VIDEOS)
+            
+            if not video_ids:
+                st.warning("영상이 없거나 가져올 수 없습니다.")
+                return
+            
+            progress = st.progress(0.0, text="영상 분석 중...")
+            rollup = build_rollup(
+                playlist_info['id'], video_ids, analyze_video_summary, SummaryStore(),
+                progress=lambda done, total: progress.progress(done / total, text=f"영상 분석 중... ({done}/{total})"),
+            )
+            progress.empty()
+            
+            if not rollup.videos:
+                st.warning("분석할 수 있는 영상이 없습니다.")
+                return
+            
+            st.session_state['rollup'] = (playlist_info, rollup)
+            st.session_state['rollup_url'] = url
+        
+        except Exception as e:
+            st.error(f"오류가 발생했습니다: {str(e)}")
+            return
+    
+    stored = st.session_state.get('rollup')
+    if stored is None or st.session_state.get('rollup_url') != url:
+        return
+    
+    try:
+        render_rollup(*stored)
+    except Exception as e:
+        st.error(f"오류가 발생했습니다: {str(e)}")
+
+
 def main():
+    setup_page()
+    
     # 헤더
     st.markdown('''
     <div class="header">
@@ -668,13 +826,23 @@ def main():
     ''', unsafe_allow_html=True)
     
     # 입력
+    mode = st.radio("분석 대상", [MODE_VIDEO, MODE_CHANNEL], horizontal=True, label_visibility="collapsed", key="mode")
     url = st.text_input(
         "YouTube URL",
-        placeholder="https://www.youtube.com/watch?v=...",
+        placeholder="https://www.youtube.com/watch?v=..." if mode == MODE_VIDEO else "https://www.youtube.com/@채널 또는 재생목록 URL",
         label_visibility="collapsed"
     )
     
-    st.markdown(f'<div class="notice">💡 댓글은 인기순으로 최대 {MAX_COMMENTS}개까지 분석됩니다.</div>', unsafe_allow_html=True)
+    if mode == MODE_CHANNEL:
+        channel_main(url)
+        return
+    
+    approximate = st.toggle(
+        "대용량 근사 분석", key="approximate",
+        help=f"댓글이 {SAMPLE_MIN_COMMENTS:,}개 이상이면 층화 표본으로 감성 비율을 먼저 보여주고, 나머지는 백그라운드에서 판정합니다.",
+    )
+    limit = APPROX_MAX_COMMENTS if approximate else MAX_COMMENTS
+    st.markdown(f'<div class="notice">💡 댓글은 인기순으로 최대 {limit:,}개까지 분석됩니다.</div>', unsafe_allow_html=True)
     
     if st.button("분석 시작", use_container_width=True):
         video_id = extract_video_id(url)
@@ -685,7 +853,7 @@ def main():
         
         try:
             with st.spinner("댓글을 수집하고 있습니다..."):
-                video_info, comments = fetch_video_data(url, MAX_COMMENTS)
+                video_info, comments = load_comments(video_id, url, approximate)
             
             if not video_info:
                 st.error("영상 정보를 가져올 수 없습니다.")
@@ -695,186 +863,47 @@ def main():
                 st.warning("댓글이 없거나 가져올 수 없습니다.")
                 return
             
-            with st.spinner("분석 중..."):
-                # 감성 분석
-                for c in comments:
-                    sent, score = analyze_sentiment(c['text'])
-                    c['sentiment'] = sent
-                    c['score'] = score
-                
-                df = pd.DataFrame(comments)
-                
-                # 통계
-                total = len(df)
-                pos_count = len(df[df['sentiment'] == 'positive'])
-                neg_count = len(df[df['sentiment'] == 'negative'])
-                neu_count = total - pos_count - neg_count
-                
-                pos_pct = pos_count / total * 100
-                neg_pct = neg_count / total * 100
-                neu_pct = neu_count / total * 100
-                
-                # 키워드
-                keywords = extract_keywords([c['text'] for c in comments], 10)
-                
-                # 요인 분석
-                factors = analyze_factors(df)
-            
-            # ===== 결과 출력 =====
-            
-            # 영상 정보
-            st.markdown('<div class="section-title">영상 정보</div>', unsafe_allow_html=True)
-            st.markdown(f'''
-            <div class="card">
-                <div class="video-title">{video_info.get("title", "")}</div>
-                <div class="video-meta">
-                    <span class="video-meta-item">👤 {video_info.get("channel", "")}</span>
-                    <span class="video-meta-item">📅 {video_info.get("upload_date", "")}</span>
-                    <span class="video-meta-item">👁 {format_number(video_info.get("view_count", 0))}</span>
-                    <span class="video-meta-item">💬 {format_number(video_info.get("total_comments", 0))}개 중 {total}개 분석</span>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            # 감성 분석
-            st.markdown('<div class="section-title">감성 분석</div>', unsafe_allow_html=True)
-            st.markdown(f'''
-            <div class="card">
-                <div class="sentiment-bar">
-                    <div class="sentiment-pos" style="width:{pos_pct}%"></div>
-                    <div class="sentiment-neu" style="width:{neu_pct}%"></div>
-                    <div class="sentiment-neg" style="width:{neg_pct}%"></div>
-                </div>
-                <div class="sentiment-labels">
-                    <span class="sentiment-label"><span class="dot dot-pos"></span> 긍정 {pos_pct:.1f}%</span>
-                    <span class="sentiment-label"><span class="dot dot-neu"></span> 중립 {neu_pct:.1f}%</span>
-                    <span class="sentiment-label"><span class="dot dot-neg"></span> 부정 {neg_pct:.1f}%</span>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            # 키워드
-            st.markdown('<div class="section-title">주요 키워드</div>', unsafe_allow_html=True)
-            kw_html = ' '.join([f'<span class="keyword-tag"><strong>{kw}</strong> {cnt}</span>' for kw, cnt in keywords[:8]])
-            st.markdown(f'<div class="card"><div class="keyword-list">{kw_html}</div></div>', unsafe_allow_html=True)
-            
-            # 워드 클라우드
-            st.markdown('<div class="section-title">워드 클라우드</div>', unsafe_allow_html=True)
+            previous = st.session_state.pop('estimate', None)
+            if previous is not None:
+                previous.cancel()
             
-            with st.spinner("워드 클라우드 생성 중..."):
-                wc = generate_wordcloud([c['text'] for c in comments])
-            
-            if wc:
-                fig, ax = plt.subplots(figsize=(10, 5))
-                ax.imshow(wc, interpolation='bilinear')
-                ax.axis('off')
-                plt.tight_layout(pad=0)
-                st.pyplot(fig)
-                plt.close()
-            else:
-                st.info("워드 클라우드를 생성할 수 없습니다.")
-            
-            # 핵심 요인
-            st.markdown('<div class="section-title">핵심 요인 분석</div>', unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if factors['positive']:
-                    factors_text = ', '.join(factors['positive'])
-                    st.markdown(f'''
-                    <div class="factor-box">
-                        <div class="factor-title">😊 긍정 반응 핵심 요인</div>
-                        <div class="factor-desc">{factors_text}</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''
-                    <div class="factor-box">
-                        <div class="factor-title">😊 긍정 반응 핵심 요인</div>
-                        <div class="factor-desc">분석된 요인 없음</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-            
-            with col2:
-                if factors['negative']:
-                    factors_text = ', '.join(factors['negative'])
-                    st.markdown(f'''
-                    <div class="factor-box">
-                        <div class="factor-title">😞 부정 반응 핵심 요인</div>
-                        <div class="factor-desc">{factors_text}</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''
-                    <div class="factor-box">
-                        <div class="factor-title">😞 부정 반응 핵심 요인</div>
-                        <div class="factor-desc">부정 댓글이 거의 없습니다</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-            
-            # 대표 댓글
-            st.markdown('<div class="section-title">대표 댓글</div>', unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            
-            pos_df = df[df['sentiment'] == 'positive']
-            neg_df = df[df['sentiment'] == 'negative']
-            
-            with col1:
-                st.markdown('<div class="comment-section-title">👍 긍정 댓글</div>', unsafe_allow_html=True)
-                if len(pos_df) > 0:
-                    for _, row in pos_df.nlargest(3, 'likes').iterrows():
-                        text = row['text'][:100] + ('...' if len(row['text']) > 100 else '')
-                        st.markdown(f'''
-                        <div class="comment-item positive">
-                            <div class="comment-text">{text}</div>
-                            <div class="comment-meta">좋아요 {int(row["likes"]):,}</div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="comment-item">긍정 댓글 없음</div>', unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown('<div class="comment-section-title">👎 부정 댓글</div>', unsafe_allow_html=True)
-                if len(neg_df) > 0:
-                    for _, row in neg_df.nlargest(3, 'likes').iterrows():
-                        text = row['text'][:100] + ('...' if len(row['text']) > 100 else '')
-                        st.markdown(f'''
-                        <div class="comment-item negative">
-                            <div class="comment-text">{text}</div>
-                            <div class="comment-meta">좋아요 {int(row["likes"]):,}</div>
-                        </div>
-                        ''', unsafe_allow_html=True)
+            with st.spinner("분석 중..."):
+                # 결과는 세션에 보관해 토글 등 재실행 시 재계산하지 않는다
+                st.session_state['analysis_url'] = url
+                reset_rep_limit()
+                if approximate and len(comments) >= SAMPLE_MIN_COMMENTS:
+                    # 오차 범위 안의 근사치를 먼저 보여주고 전수 판정은 백그라운드에서
+                    estimate = SentimentEstimate(video_info, comments)
+                    estimate.refine_to()
+                    st.session_state['estimate'] = estimate.start()
+                    st.session_state['estimate_video_id'] = video_id
+                    st.session_state['analysis'] = None
                 else:
-                    st.markdown('<div class="comment-item">부정 댓글이 거의 없습니다 🎉</div>', unsafe_allow_html=True)
-            
-            # 베스트 댓글
-            st.markdown('<div class="section-title">베스트 댓글 TOP 5</div>', unsafe_allow_html=True)
-            
-            for i, (_, row) in enumerate(df.nlargest(5, 'likes').iterrows(), 1):
-                text = row['text'][:120] + ('...' if len(row['text']) > 120 else '')
-                st.markdown(f'''
-                <div class="comment-item best">
-                    <div class="comment-text"><strong>#{i}</strong> {text}</div>
-                    <div class="comment-meta">좋아요 {int(row["likes"]):,}</div>
-                </div>
-                ''', unsafe_allow_html=True)
-            
-            # 종합 인사이트
-            st.markdown('<div class="section-title">종합 인사이트</div>', unsafe_allow_html=True)
-            insight = generate_insight(video_info, pos_pct, neg_pct, factors, keywords)
-            st.markdown(f'''
-            <div class="insight-box">
-                <div class="insight-title">💡 분석 요약</div>
-                <div class="insight-text">{insight}</div>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            # 푸터
-            st.markdown('<div class="footer">유튜브 댓글 분석기 v2.0</div>', unsafe_allow_html=True)
-            
+                    analysis = CommentAnalysis(video_info, comments)
+                    st.session_state['analysis'] = analysis
+                    save_analysis(video_id, analysis)
+        
         except Exception as e:
             st.error(f"오류가 발생했습니다: {str(e)}")
+            return
+    
+    if st.session_state.get('analysis_url') != url:
+        return
+    
+    if st.session_state.get('estimate') is not None:
+        live_estimate()
+        if not hasattr(st, 'fragment'):
+            st.button("근사 결과 새로고침")
+        return
+    
+    analysis = st.session_state.get('analysis')
+    if analysis is None:
+        return
+    
+    try:
+        render_results(analysis)
+    except Exception as e:
+        st.error(f"오류가 발생했습니다: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+영상 요약 / 채널 롤업
+=====================
+- AnalysisSummary: 분석 결과를 작고 병합 가능한 요약으로 (감성 수, 키워드, 요인, 인기 댓글)
+- SummaryStore: 영상별 요약과 채널/재생목록 롤업을 JSON 파일로 보관
+- 채널 롤업은 영상 요약을 병합해서 만든다 (댓글을 다시 읽지 않음)
+  → 새 영상 1개 추가 = 그 영상 분석 1회 + 저장된 롤업에 요약 병합 1회
+  → 목록에서 빠진 영상이 있거나 오래된 요약이 섞였을 때만 현재 목록으로 다시 만든다
+"""
+
+import heapq
+import json
+import os
+import re
+import time
+from collections import Counter
+
+from analyzer import CommentAnalysis, generate_insight, top_factors
+
+# =============================================================================
+# 설정
+# =============================================================================
+SUMMARY_DIR = os.environ.get('SUMMARY_DIR', os.path.join('data', 'summaries'))
+KEYWORD_SKETCH_SIZE = 300   # 요약에 남기는 키워드 수 (병합 후에도 이 크기로 자름)
+TOP_COMMENT_COUNT = 10      # 감성별로 남기는 인기 댓글 수
+COMMENT_TEXT_LIMIT = 300    # 요약에 저장하는 댓글 길이
+SUMMARY_MAX_AGE = 7 * 24 * 3600  # 영상 요약 유효 기간 (초) — 지나면 롤업 때 다시 분석
+
+# =============================================================================
+# 요약
+# =============================================================================
+class AnalysisSummary:
+    """
+    영상 1개 또는 여러 영상을 합친 분석 요약
+    - 모든 필드가 합산/상위 k 병합이 가능해서 update() 로 다른 요약을 흡수한다
+    - 키워드는 상위 KEYWORD_SKETCH_SIZE 개만 유지하는 근사치 (영상 수와 무관한 크기)
+    """
+    
+    def __init__(self):
+        self.videos = {}    # video_id → {'title', 'total', 'positive', 'negative', 'summarized_at'}
+        self.sentiment = Counter()
+        self.keywords = Counter()
+        self.factors = {'positive': Counter(), 'negative': Counter()}
+        self.top_comments = {'positive': [], 'negative': [], 'best': []}
+    
+    @classmethod
+    def from_analysis(cls, video_id: str, analysis: CommentAnalysis) -> 'AnalysisSummary':
+        summary = cls()
+        summary.videos[video_id] = {
+            'title': analysis.video_info.get('title', ''),
+            'total': analysis.total,
+            'positive': analysis.pos_count,
+            'negative': analysis.neg_count,
+            'summarized_at': int(time.time()),
+        }
+        summary.sentiment.update({
+            'positive': analysis.pos_count,
+            'neutral': analysis.neu_count,
+            'negative': analysis.neg_count,
+        })
+        summary.keywords.update(dict(analysis.keyword_counts.most_common(KEYWORD_SKETCH_SIZE)))
+        for sentiment, scores in analysis.factor_scores.items():
+            summary.factors[sentiment].update(scores)
+        
+        ranking = analysis.ranking
+        for key, sentiment in (('positive', 'positive'), ('negative', 'negative'), ('best', None)):
+            summary.top_comments[key] = [
+                {'text': c['text'][:COMMENT_TEXT_LIMIT], 'likes': int(c['likes']), 'video_id': video_id}
+                for c in ranking.top(TOP_COMMENT_COUNT, sentiment)
+            ]
+        return summary
+    
+    def update(self, other: 'AnalysisSummary') -> 'AnalysisSummary':
+        """
+        다른 요약을 합친다 (제자리 병합)
+        - 영상이 겹치지 않는 요약끼리만 병합 가능 (합산된 수치에서 겹친 영상 몫을 뺄 수 없으므로)
+        - 겹치는 영상이 있으면 ValueError
+        """
+        overlap = self.videos.keys() & other.videos.keys()
+        if overlap:
+            raise ValueError(f"이미 포함된 영상이 있어 병합할 수 없습니다: {', '.join(sorted(overlap))}")
+        
+        self.videos.update(other.videos)
+        self.sentiment.update(other.sentiment)
+        self.keywords.update(other.keywords)
+        if len(self.keywords) > KEYWORD_SKETCH_SIZE:
+            self.keywords = Counter(dict(self.keywords.most_common(KEYWORD_SKETCH_SIZE)))
+        for sentiment in self.factors:
+            self.factors[sentiment].update(other.factors.get(sentiment, {}))
+        for key in self.top_comments:
+            merged = self.top_comments[key] + other.top_comments.get(key, [])
+            self.top_comments[key] = heapq.nlargest(TOP_COMMENT_COUNT, merged, key=lambda c: c['likes'])
+        return self
+    
+    # === 집계 값 ===
+    @property
+    def total(self) -> int:
+        return sum(self.sentiment.values())
+    
+    def pct(self, sentiment: str) -> float:
+        return self.sentiment[sentiment] / self.total * 100 if self.total else 0.0
+    
+    def top_keywords(self, n: int = 10) -> list:
+        return self.keywords.most_common(n)
+    
+    def top_factors(self, n: int = 3) -> dict:
+        return top_factors(self.factors, n)
+    
+    def insight(self, title: str = '') -> str:
+        return generate_insight({'title': title}, self.pct('positive'), self.pct('negative'),
+                                self.top_factors(), self.top_keywords())
+    
+    # === 직렬화 ===
+    def to_dict(self) -> dict:
+        return {
+            'videos': self.videos,
+            'sentiment': dict(self.sentiment),
+            'keywords': dict(self.keywords),
+            'factors': {s: dict(c) for s, c in self.factors.items()},
+            'top_comments': self.top_comments,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AnalysisSummary':
+        summary = cls()
+        summary.videos = dict(data.get('videos', {}))
+        summary.sentiment = Counter(data.get('sentiment', {}))
+        summary.keywords = Counter(data.get('keywords', {}))
+        for sentiment in summary.factors:
+            summary.factors[sentiment] = Counter(data.get('factors', {}).get(sentiment, {}))
+        for key in summary.top_comments:
+            summary.top_comments[key] = list(data.get('top_comments', {}).get(key, []))
+        return summary
+
+
+# =============================================================================
+# 저장소
+# =============================================================================
+class SummaryStore:
+    """
+    요약 JSON 저장소
+    - <root>/videos/<video_id>.json : 영상별 요약
+    - <root>/rollups/<name>.json    : 채널/재생목록 롤업
+    """
+    
+    def __init__(self, root: str = SUMMARY_DIR):
+        self.root = root
+    
+    def _path(self, kind: str, name: str) -> str:
+        return os.path.join(self.root, kind, re.sub(r'[^a-zA-Z0-9_.@-]', '_', name) + '.json')
+    
+    def _read(self, path: str, max_age: float = None):
+        if not os.path.exists(path):
+            return None
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, encoding='utf-8') as f:
+            return AnalysisSummary.from_dict(json.load(f))
+    
+    def _write(self, path: str, summary: AnalysisSummary):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    def load(self, video_id: str, max_age: float = None):
+        """영상 요약 (없거나 max_age 초보다 오래됐으면 None)"""
+        return self._read(self._path('videos', video_id), max_age)
+    
+    def save(self, video_id: str, summary: AnalysisSummary):
+        self._write(self._path('videos', video_id), summary)
+    
+    def load_rollup(self, name: str):
+        return self._read(self._path('rollups', name))
+    
+    def save_rollup(self, name: str, summary: AnalysisSummary):
+        self._write(self._path('rollups', name), summary)
+
+
+# =============================================================================
+# 채널 롤업
+# =============================================================================
+def build_rollup(name: str, video_ids: list, analyze, store: SummaryStore, progress=None) -> AnalysisSummary:
+    """
+    채널/재생목록 롤업 갱신
+    - 저장된 롤업의 영상이 모두 video_ids 에 있고 요약이 SUMMARY_MAX_AGE 이내면 새 영상만 병합
+    - 목록에서 빠진 영상이 있거나 오래된 요약이 있으면 video_ids 의 영상 요약으로 처음부터 다시 병합
+    - 영상 요약은 저장된 것이 SUMMARY_MAX_AGE 이내면 재사용, 아니면 analyze(video_id) → AnalysisSummary | None 호출
+    - progress(done, total) 콜백으로 진행률 전달
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    rollup = store.load_rollup(name)
+    if rollup is None or not _is_current(rollup, video_ids):
+        rollup = AnalysisSummary()
+    
+    for done, video_id in enumerate(video_ids, 1):
+        if video_id not in rollup.videos:
+            summary = store.load(video_id, max_age=SUMMARY_MAX_AGE)
+            if summary is None:
+                summary = analyze(video_id)
+                if summary is not None:
+                    store.save(video_id, summary)
+            if summary is not None:
+                rollup.update(summary)
+        if progress:
+            progress(done, len(video_ids))
+    
+    store.save_rollup(name, rollup)
+    return rollup
+
+
+def _is_current(rollup: AnalysisSummary, video_ids: list) -> bool:
+    """롤업의 영상이 모두 현재 목록에 있고 요약이 오래되지 않았는지 (새 영상만 병합해도 되는지)"""
+    listed = set(video_ids)
+    now = time.time()
+    return all(
+        video_id in listed and now - video.get('summarized_at', 0) <= SUMMARY_MAX_AGE
+        for video_id, video in rollup.videos.items()
+    )
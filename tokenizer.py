@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+토큰화
+======
+- 키워드 / 워드 클라우드 / 검색 색인이 함께 쓰는 토큰화 단계
+- 기본값은 한국어 조사·어미 분리 (외부 형태소 분석기 없이 규칙 기반)
+  재밌어요 / 재밌다 / 재밌네 → 재밌, 영상에서도 → 영상
+- 표면형 → 어간 결과는 프로세스 단위로 메모해 같은 형태는 한 번만 분석
+- set_tokenizer() 로 다른 토크나이저(공백 분리 등)로 교체 가능
+"""
+
+import os
+import re
+from functools import lru_cache
+
+STEM_CACHE_SIZE = 200_000  # 표면형 → 어간 메모 최대 항목 수
+
+STOPWORDS = {'은', '는', '이', '가', '을', '를', '에', '에서', '의', '와', '과', '도', '만', '로', '으로',
+             '하고', '그리고', '그런데', '하지만', '그래서', '또', '더', '막', '좀', '이제', '진짜', '너무', '정말', '완전',
+             '것', '거', '수', '때', '중', '년', '월', '일', '번', '분', '게', '데', '뭐', '왜', '어떻게',
+             '나', '너', '우리', '저', '영상', '댓글', '유튜브', '채널', '구독', '좋아요', '시청',
+             'the', 'a', 'an', 'is', 'are', 'to', 'of', 'in', 'for', 'on', 'with', 'this', 'that',
+             'i', 'you', 'it', 'and', 'but', 'or', 'so', 'video', 'comment', 'like', 'just'}
+
+URL_RE = re.compile(r'http\S+')
+NON_WORD_RE = re.compile(r'[^\w\s가-힣]')
+HANGUL_WORD_RE = re.compile(r'[가-힣]+')
+
+# =============================================================================
+# 조사 / 어미 목록 (긴 것부터 검사)
+# =============================================================================
+
+# 어미 (용언 활용·서술격 조사 포함)
+ENDINGS = sorted({
+    '었습니다', '았습니다', '했습니다', '입니다', '합니다', '습니다',
+    '었어요', '았어요', '였어요', '했어요', '이에요', '이네요', '인가요', '이에여',
+    '해요', '어요', '아요', '여요', '에요', '예요', '네요', '군요', '세요', '어여', '아여',
+    '었다', '았다', '했다', '었어', '았어', '했어', '었네', '았네', '했네',
+    '이다', '이네', '이야', '이지', '인데', '는데', '은데', '지만', '어서', '아서', '해서', '니까',
+    '하다', '하네', '하고', '하게', '하지', '하면', '하는', '으면', '는다', '구나', '잖아',
+    '다', '네', '어', '아', '해', '요', '지', '고', '게', '음', '은', '는', '던', '면', '죠', '임',
+}, key=len, reverse=True)
+
+# 조사
+PARTICLES = sorted({
+    '에게서', '한테서', '으로서', '으로써', '에서는', '에서도', '이라고', '이랑', '까지',
+    '에서', '에게', '한테', '께서', '으로', '처럼', '보다', '부터', '마저', '조차', '이나', '라고', '하고',
+    '은', '는', '이', '가', '을', '를', '에', '의', '와', '과', '도', '만', '로', '랑',
+}, key=len, reverse=True)
+
+
+# 한 음절 어미(고, 지, 면, 음, 네, 어 ...)는 용언처럼 보이는 음절 뒤에서만 뗀다
+# (ㅆ 받침 — 했, 었, 있, 겠 — 또는 아래 음절) → 광고, 장면, 동네, 강아지 같은 명사는 그대로
+VERB_LIKE_SYLLABLES = set('하되없같싶않좋싫많')
+
+# 앞 음절 받침에 맞을 때만 떼는 조사 (그 외 조사는 받침과 무관)
+PARTICLES_AFTER_CONSONANT = {'이', '은', '을', '과', '으로', '으로서', '으로써', '이랑', '이나', '이라고'}
+PARTICLES_AFTER_VOWEL = {'가', '는', '를', '와', '로', '랑', '라고'}
+
+# 조사·어미처럼 끝나지만 그 자체가 명사인 단어 (이 단어로 시작하면 이 단어가 어간)
+NOUNS = {'고양이', '원숭이', '어린이', '목걸이', '귀걸이', '멍멍이'}
+
+FINAL_RIEUL = 8     # ㄹ 받침
+FINAL_SSANGSIOT = 20    # ㅆ 받침
+
+
+def _final(syllable: str) -> int:
+    """받침 번호 (없으면 0)"""
+    return (ord(syllable) - 0xAC00) % 28
+
+
+def _has_final_consonant(syllable: str) -> bool:
+    return _final(syllable) != 0
+
+
+def _is_verb_like(syllable: str) -> bool:
+    return _final(syllable) == FINAL_SSANGSIOT or syllable in VERB_LIKE_SYLLABLES
+
+
+def _fits_particle(syllable: str, particle: str) -> bool:
+    """조사가 앞 음절 받침과 맞는지 (책이 / 영화가, 서울로 / 집으로)"""
+    final = _final(syllable)
+    if particle in PARTICLES_AFTER_CONSONANT:
+        return final != 0 and not (particle.startswith('으') and final == FINAL_RIEUL)
+    if particle in PARTICLES_AFTER_VOWEL:
+        return final == 0 or (particle == '로' and final == FINAL_RIEUL)
+    return True
+
+
+def _strip_suffix(word: str, suffixes: list, allow_single: bool) -> str:
+    """
+    접미사 하나를 떼어낸다
+    - 남는 부분은 두 음절 이상이어야 한다
+    - allow_single 이면 받침 있는 한 음절도 허용 (용언 어간: 좋다 → 좋, 싫어 → 싫)
+      바다, 사고, 마음 처럼 받침 없는 한 음절이 남는 경우는 그대로 둔다
+    """
+    for suffix in suffixes:
+        if len(word) > len(suffix) and word.endswith(suffix):
+            rest = word[:-len(suffix)]
+            if len(rest) >= 2 or (allow_single and _has_final_consonant(rest)):
+                return rest
+    return word
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def strip_ending(word: str) -> str:
+    """어미만 분리 (감성 사전 어간화용)"""
+    if not HANGUL_WORD_RE.fullmatch(word):
+        return word
+    return _strip_suffix(word, ENDINGS, allow_single=True)
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word: str) -> str:
+    """
+    표면형 → 키워드용 어간 (어미가 있으면 어미, 없으면 조사를 하나 분리)
+    - 두 음절 이상 남을 때만 분리, 아니면 표면형 그대로 (좋아요 → 좋아요, 광고 → 광고)
+    - 한 음절 어미는 용언처럼 보이는 음절 뒤에서만 (재밌다 → 재밌, 강아지 → 강아지)
+    - 조사는 앞 음절 받침에 맞을 때만 (광고가 → 광고, 전문가 → 전문가)
+    """
+    if not HANGUL_WORD_RE.fullmatch(word):
+        return word
+    for n in range(len(word), 2, -1):
+        if word[:n] in NOUNS:
+            return word[:n]
+    
+    # 가장 긴 어미/조사 하나만 본다 (집으로 에서 으로 를 못 떼면 로 만 떼지 않음)
+    ending = next((e for e in ENDINGS if len(word) > len(e) and word.endswith(e)), None)
+    if ending:
+        rest = word[:-len(ending)]
+        if len(rest) >= 2 and (len(ending) > 1 or _is_verb_like(rest[-1])):
+            return rest
+    particle = next((p for p in PARTICLES if len(word) > len(p) and word.endswith(p)), None)
+    if particle:
+        rest = word[:-len(particle)]
+        if len(rest) >= 2 and _fits_particle(rest[-1], particle):
+            return rest
+    return word
+
+
+# =============================================================================
+# 토크나이저
+# =============================================================================
+def split_words(text: str) -> list:
+    """URL·특수문자 제거 후 공백 분리 (불용어·한 글자 제외)"""
+    if not text:
+        return []
+    text = URL_RE.sub('', text.lower())
+    text = NON_WORD_RE.sub(' ', text)
+    return [t for t in text.split() if t not in STOPWORDS and len(t) > 1]
+
+
+def korean_tokenize(text: str) -> list:
+    """공백 분리 + 조사·어미 분리 (어간이 불용어면 제외)"""
+    tokens = []
+    for word in split_words(text):
+        token = stem(word)
+        if token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+TOKENIZERS = {
+    'korean': korean_tokenize,
+    'whitespace': split_words,
+}
+
+_tokenizer = TOKENIZERS[os.environ.get('TOKENIZER', 'korean')]
+
+
+def set_tokenizer(tokenizer) -> None:
+    """토크나이저 교체 (TOKENIZERS 의 이름 또는 text → list 함수)"""
+    global _tokenizer
+    _tokenizer = TOKENIZERS[tokenizer] if isinstance(tokenizer, str) else tokenizer
+
+
+def tokenize(text: str) -> list:
+    """키워드/워드 클라우드/검색용 토큰화 (현재 토크나이저 사용)"""
+    return _tokenizer(text)
+
+
+def query_tokens(term: str) -> list:
+    """
+    검색어 한 단어 → 색인과 같은 형태의 토큰 목록
+    - 불용어·한 글자처럼 색인에 들어가지 않는 단어는 빈 목록 (질의에서 무시)
+    """
+    return tokenize(term)